@@ -0,0 +1,274 @@
+"""
+헤드리스 벤치마크 스크립트.
+브라우저 없이 데이터 로드(`load_and_prepare_data` + 인덱스 생성), 필터링, 카드 그리드 렌더링,
+룰렛 후보 생성 경로를 반복 실행하여 지연 시간 백분위수, 전송량(HTML/JSON 바이트), 최대 메모리를 측정합니다.
+`eden_roulette_data.csv` 를 10배·100배 등으로 복제한 합성 로스터를 임시 디렉토리에 만들어 함께 측정하며,
+결과를 기준선(JSON)으로 저장해 두고 이후 실행과 비교할 수 있습니다. 네트워크 없이 동작합니다.
+
+사용법:
+    python bench_eden.py                                # 1×, 10×, 100× 로스터 측정
+    python bench_eden.py --scales 1 10 --repeat 30      # 배율·반복 횟수 지정
+    python bench_eden.py --save-baseline bench_baseline.json
+    python bench_eden.py --compare bench_baseline.json  # 기준선 대비 중앙값 비교 (회귀 시 표시)
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CSV_PATH = os.path.join(BASE_DIR, "eden_roulette_data.csv")
+DEFAULT_SCALES = (1, 10, 100)
+DEFAULT_REPEAT = 20
+DEFAULT_PAGE_SIZE = 48
+
+# 전체 그리드 렌더링(페이지 크기 "전체")은 이 행 수 이하의 로스터에서만 측정 (100× 로스터는 수십 초 소요)
+FULL_GRID_MAX_ROWS = 5000
+
+# 기준선 대비 중앙값이 이 배율을 넘으면 회귀로 표시
+DEFAULT_REGRESSION_RATIO = 1.25
+
+# 필터링 벤치마크에서 돌아가며 사용하는 (선택값, 이름 검색어) 조합
+FILTER_CASES = (
+    ({}, ''),
+    ({'희귀도': ['5★ SA']}, ''),
+    ({'속성명': ['불', '물']}, ''),
+    ({'희귀도': ['5★'], '무기명': ['검']}, ''),
+    ({}, '레이'),
+    ({}, 'ㄹㅇㅂ'),
+    ({}, 'aldo'),
+)
+
+
+def _import_app():
+    """Streamlit 스크립트를 bare 모드로 import (main() 은 실행되지 않음)."""
+    os.chdir(BASE_DIR)
+    if BASE_DIR not in sys.path:
+        sys.path.insert(0, BASE_DIR)
+    import logging
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    import streamlit_eden_restructure as app
+    return app
+
+
+def make_synthetic_roster(csv_path: str, scale: int, out_path: str) -> int:
+    """
+    원본 CSV 를 `scale` 배로 복제한 합성 로스터를 기록합니다.
+    복제본의 캐릭터명에는 " #n" 접미사를 붙여 이름이 겹치지 않게 하고, 출시일은 n일씩 앞당깁니다.
+
+    Returns:
+        int: 합성 로스터의 행 수.
+    """
+    base = pd.read_csv(csv_path).fillna('')
+    if scale <= 1:
+        base.to_csv(out_path, index=False)
+        return len(base)
+    copies = []
+    for n in range(scale):
+        copy = base.copy()
+        if n:
+            copy['캐릭터명'] = copy['캐릭터명'].astype(str) + f" #{n}"
+            if '출시일' in copy.columns:
+                released = pd.to_datetime(copy['출시일'], errors='coerce') - pd.Timedelta(days=n)
+                copy['출시일'] = released.dt.strftime('%Y-%m-%d').fillna('')
+        copies.append(copy)
+    roster = pd.concat(copies, ignore_index=True)
+    roster.to_csv(out_path, index=False)
+    return len(roster)
+
+
+def _measure(fn, repeat: int) -> dict:
+    """
+    `fn()` 을 한 번 예열한 뒤 `repeat` 번 실행하여 지연 시간 통계를 구하고,
+    추가로 한 번 tracemalloc 아래에서 실행해 최대 메모리를 잽니다 (타이밍과 분리).
+    `fn` 의 반환값이 bytes 수(int)이면 전송량으로 기록합니다.
+    """
+    payload = fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    ms = np.array(samples) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p90_ms": round(float(np.percentile(ms, 90)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3),
+        "mean_ms": round(float(ms.mean()), 3),
+        "payload_bytes": int(payload) if isinstance(payload, int) else None,
+        "peak_kb": round(peak / 1024, 1),
+        "repeat": repeat,
+    }
+
+
+def run_scale(app, csv_path: str, repeat: int, page_size: int = DEFAULT_PAGE_SIZE,
+              full_grid_max_rows: int = FULL_GRID_MAX_ROWS) -> dict:
+    """한 로스터에 대해 load / index / filter / render / spin 시나리오를 측정합니다."""
+    from eden_data import CharacterIndex, FilterEngine, DEFAULT_COLUMN_MAP, MATCH_ALL
+    from eden_roulette import RouletteEngine
+    from eden_search import load_name_aliases
+    from eden_assets import CARD_ICON_SIZE, SLOT_ICON_SIZE
+
+    column_map = dict(DEFAULT_COLUMN_MAP)
+    load = getattr(app.load_and_prepare_data, "__wrapped__", app.load_and_prepare_data)  # st.cache_data 우회
+    aliases = load_name_aliases(str(app.ALIAS_CSV_PATH))
+    results = {}
+
+    def bench_load():
+        load(csv_path, column_map)
+        return os.path.getsize(csv_path)
+    results["load"] = _measure(bench_load, repeat)
+
+    df, *_ = load(csv_path, column_map)
+    results["index"] = _measure(lambda: CharacterIndex(df, column_map, aliases=aliases) and None, repeat)
+    index = CharacterIndex(df, column_map, aliases=aliases)
+
+    engine = FilterEngine(index, {'속성명': MATCH_ALL})
+
+    def bench_filter():
+        for selections, name_query in FILTER_CASES:
+            engine.query(selections, name_query).nonzero()
+            engine.facet_counts(selections, name_query)
+    results["filter"] = _measure(bench_filter, repeat)
+
+    page_df = index.df.iloc[:page_size]
+
+    def bench_render_page():
+        html_str, _ = app.build_card_grid_html(page_df, column_map)
+        return len(html_str.encode("utf-8"))
+    results["render_page"] = _measure(bench_render_page, repeat)
+
+    def bench_render_all():
+        html_str, _ = app.build_card_grid_html(index.df, column_map)
+        return len(html_str.encode("utf-8"))
+    if len(index) <= full_grid_max_rows:
+        results["render_all"] = _measure(bench_render_all, max(3, repeat // 5))
+
+    roulette = RouletteEngine(index, seed=0)
+    row_ids = np.arange(len(index))
+    name_col, icon_col = column_map['이름'], column_map['캐릭터아이콘경로']
+
+    def bench_spin():
+        # 메인 스크립트의 룰렛 버튼 경로와 같은 후보 생성 (릴 썸네일 + 당첨자 큰 이미지)
+        spin = roulette.spin(row_ids)
+        reel_df = index.df.iloc[spin.reel]
+        items = [
+            {"name": name, "icon_base64": app.icon_src(icon_path, CARD_ICON_SIZE)}
+            for name, icon_path in zip(reel_df[name_col], reel_df[icon_col])
+        ]
+        winner_image = app.icon_src(index.df.iloc[spin.winner][icon_col], SLOT_ICON_SIZE)
+        return len(json.dumps(items)) + len(winner_image)
+    results["spin"] = _measure(bench_spin, repeat)
+    return results
+
+
+def environment_info() -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "asset_mode": os.environ.get("EDEN_ASSET_MODE", "inline"),
+    }
+
+
+def run_benchmarks(csv_path=DEFAULT_CSV_PATH, scales=DEFAULT_SCALES, repeat: int = DEFAULT_REPEAT) -> dict:
+    """
+    배율별 합성 로스터를 만들어 모든 시나리오를 측정합니다.
+
+    Returns:
+        dict: {"env": 환경 정보, "results": {"<배율>x": {"rows": 행 수, "<시나리오>": 통계, ...}}}
+    """
+    app = _import_app()
+    report = {"env": environment_info(), "results": {}}
+    with tempfile.TemporaryDirectory(prefix="eden_bench_") as tmp:
+        for scale in scales:
+            roster_path = os.path.join(tmp, f"roster_{scale}x.csv")
+            rows = make_synthetic_roster(csv_path, scale, roster_path)
+            print(f"[{scale}x] {rows:,}명 측정 중...", file=sys.stderr)
+            results = run_scale(app, roster_path, repeat)
+            report["results"][f"{scale}x"] = {"rows": rows, **results}
+    return report
+
+
+def compare(report: dict, baseline: dict, ratio: float = DEFAULT_REGRESSION_RATIO) -> list:
+    """
+    기준선 대비 중앙값(p50) 비율을 계산합니다.
+
+    Returns:
+        list[tuple]: (배율, 시나리오, 기준 p50, 현재 p50, 비율, 회귀 여부) 목록.
+    """
+    rows = []
+    for scale, scenarios in report["results"].items():
+        base_scenarios = baseline.get("results", {}).get(scale, {})
+        for name, stats in scenarios.items():
+            base = base_scenarios.get(name)
+            if not isinstance(stats, dict) or not isinstance(base, dict) or not base.get("p50_ms"):
+                continue
+            change = stats["p50_ms"] / base["p50_ms"]
+            rows.append((scale, name, base["p50_ms"], stats["p50_ms"], change, change > ratio))
+    return rows
+
+
+def print_report(report: dict):
+    header = f"{'scale':>6} {'rows':>7} {'scenario':<12} {'p50':>9} {'p90':>9} {'p99':>9} {'payload':>11} {'peak':>10}"
+    print(header)
+    print("-" * len(header))
+    for scale, scenarios in report["results"].items():
+        for name, stats in scenarios.items():
+            if not isinstance(stats, dict):
+                continue
+            payload = f"{stats['payload_bytes'] / 1024:,.1f} KB" if stats["payload_bytes"] is not None else "-"
+            print(f"{scale:>6} {scenarios['rows']:>7,} {name:<12} {stats['p50_ms']:>7.2f}ms {stats['p90_ms']:>7.2f}ms "
+                  f"{stats['p99_ms']:>7.2f}ms {payload:>11} {stats['peak_kb']:>7,.0f} KB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Another Eden 룰렛 헤드리스 벤치마크")
+    parser.add_argument("--csv", default=DEFAULT_CSV_PATH, help="원본 CSV 경로")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES), help="로스터 복제 배율")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="시나리오별 반복 횟수")
+    parser.add_argument("--json", help="결과 JSON 을 기록할 경로")
+    parser.add_argument("--save-baseline", help="결과를 기준선으로 저장할 경로")
+    parser.add_argument("--compare", help="비교할 기준선 JSON 경로")
+    parser.add_argument("--ratio", type=float, default=DEFAULT_REGRESSION_RATIO, help="회귀로 판단할 p50 배율")
+    parser.add_argument("--fail-on-regression", action="store_true", help="회귀가 있으면 종료 코드 1")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.csv, args.scales, args.repeat)
+    print_report(report)
+
+    for path in (args.json, args.save_baseline):
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=1)
+            print(f"결과 저장 → {path}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(report, baseline, args.ratio)
+        print(f"\n기준선 비교 ({args.compare}, 기준 환경 Python {baseline.get('env', {}).get('python', '?')})")
+        for scale, name, base_ms, cur_ms, change, regressed in rows:
+            mark = "  ← 회귀" if regressed else ""
+            print(f"{scale:>6} {name:<12} {base_ms:>8.2f}ms → {cur_ms:>8.2f}ms ({change:>5.2f}x){mark}")
+        if args.fail_on_regression and any(r[-1] for r in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""
+에셋 빌드 스크립트.
+`character_art/` 아래의 아이콘을 화면 표시 크기별 썸네일(WebP, PNG)로 미리 변환하고,
+`elements_equipment` 배지 아이콘은 하나의 스프라이트 시트(아틀라스)로 묶어
+내용 해시가 붙은 파일명으로 `static/eden/` 에 저장한 뒤 manifest.json 을 기록합니다.
+
+사용법:
+    python build_assets.py                 # 기본 크기(24, 50, 280px)로 빌드
+    python build_assets.py --sizes 24 50   # 특정 크기만 빌드
+    python build_assets.py --no-sprite     # 스프라이트 시트 생략
+"""
+import os
+import io
+import sys
+import json
+import hashlib
+import argparse
+from pathlib import Path
+
+from eden_assets import BASE_DIR, ASSET_OUT_DIR, MANIFEST_NAME, THUMBNAIL_SIZES, asset_key, file_sha1
+
+SOURCE_DIR = BASE_DIR / "character_art"
+SPRITE_SOURCE_DIR = SOURCE_DIR / "elements_equipment"
+SPRITE_COLUMNS = 8
+
+
+def _encode_variant(img, fmt: str) -> bytes:
+    """Pillow 이미지를 지정 포맷으로 압축 인코딩한 바이트를 반환."""
+    buf = io.BytesIO()
+    if fmt == "webp":
+        img.save(buf, format="WEBP", quality=85, method=4)
+    else:
+        img.save(buf, format="PNG", optimize=True)
+    return buf.getvalue()
+
+
+def _write_hashed(out_dir: Path, stem: str, fmt: str, data: bytes, written: set) -> str:
+    """내용 해시가 붙은 파일명으로 기록하고 파일명을 반환 (같은 내용이면 재사용)."""
+    digest = hashlib.sha1(data).hexdigest()[:10]
+    file_name = f"{stem}.{digest}.{fmt}"
+    target = out_dir / file_name
+    if not target.exists():
+        target.write_bytes(data)
+    written.add(file_name)
+    return file_name
+
+
+def build_thumbnails(source_dir, out_dir, sizes, written: set) -> dict:
+    """
+    원본 아이콘마다 크기별 WebP/PNG 썸네일을 만듭니다.
+
+    원본보다 큰 크기로는 확대하지 않으며(브라우저가 확대 표시), 파일명에 결과물 내용 해시를 붙여
+    같은 내용의 변형은 하나의 파일을 공유합니다.
+
+    Args:
+        source_dir: 원본 PNG 가 있는 디렉토리.
+        out_dir: 썸네일을 기록할 디렉토리.
+        sizes: 생성할 표시 크기 목록 (px).
+        written: 기록한 파일명을 추가할 집합 (이전 산출물 정리에 사용).
+
+    Returns:
+        dict: manifest 의 "assets" 항목 (asset_key → 변형 정보).
+    """
+    from PIL import Image  # 빌드 시에만 필요
+
+    assets = {}
+
+    for src in sorted(Path(source_dir).rglob("*.png")):
+        try:
+            with Image.open(src) as im:
+                im.load()
+                source = im.convert("RGBA")
+        except Exception as e:
+            print(f"[Skip] {src}: {e}", file=sys.stderr)
+            continue
+
+        variants = {}
+        for size in sorted(set(int(s) for s in sizes)):
+            thumb = source.copy()
+            thumb.thumbnail((size, size), Image.LANCZOS)
+            formats = {}
+            for fmt in ("webp", "png"):
+                data = _encode_variant(thumb, fmt)
+                file_name = _write_hashed(out_dir, f"{src.stem.lower()}.{size}", fmt, data, written)
+                formats[fmt] = {"file": file_name, "bytes": len(data), "width": thumb.width, "height": thumb.height}
+            variants[str(size)] = formats
+
+        assets[asset_key(str(src))] = {
+            "source_sha1": file_sha1(str(src)),
+            "source_bytes": src.stat().st_size,
+            "variants": variants,
+        }
+    return assets
+
+
+def build_sprite_sheet(source_dir, out_dir, written: set, columns: int = SPRITE_COLUMNS):
+    """
+    배지 아이콘들을 하나의 아틀라스 이미지로 묶습니다.
+
+    각 아이콘은 원본 해상도의 정사각형 칸(가장 큰 아이콘 기준)에 중앙 정렬되며,
+    런타임에는 CSS background-position 으로 잘라 표시합니다.
+
+    Args:
+        source_dir: 배지 PNG 가 있는 디렉토리.
+        out_dir: 아틀라스를 기록할 디렉토리.
+        written: 기록한 파일명을 추가할 집합.
+        columns: 아틀라스 한 줄의 칸 수.
+
+    Returns:
+        dict | None: manifest 의 "sprite" 항목. 아이콘이 없으면 None.
+    """
+    from PIL import Image  # 빌드 시에만 필요
+
+    icons = []
+    for src in sorted(Path(source_dir).glob("*.png")):
+        try:
+            with Image.open(src) as im:
+                im.load()
+                icons.append((src, im.convert("RGBA")))
+        except Exception as e:
+            print(f"[Skip] {src}: {e}", file=sys.stderr)
+    if not icons:
+        return None
+
+    cell = max(max(img.width, img.height) for _, img in icons)
+    columns = max(1, min(columns, len(icons)))
+    rows = (len(icons) + columns - 1) // columns
+    atlas = Image.new("RGBA", (columns * cell, rows * cell), (0, 0, 0, 0))
+
+    entries = {}
+    for i, (src, img) in enumerate(icons):
+        col, row = i % columns, i // columns
+        atlas.paste(img, (col * cell + (cell - img.width) // 2, row * cell + (cell - img.height) // 2))
+        entries[asset_key(str(src))] = {"index": i, "col": col, "row": row, "source_sha1": file_sha1(str(src))}
+
+    formats = {}
+    for fmt in ("webp", "png"):
+        data = _encode_variant(atlas, fmt)
+        formats[fmt] = {"file": _write_hashed(out_dir, "sprite", fmt, data, written), "bytes": len(data)}
+    return {"cell": cell, "columns": columns, "rows": rows, "formats": formats, "icons": entries}
+
+
+def build_all(source_dir=SOURCE_DIR, out_dir=ASSET_OUT_DIR, sizes=THUMBNAIL_SIZES, sprite_dir=SPRITE_SOURCE_DIR) -> dict:
+    """
+    썸네일과 스프라이트 시트를 빌드하고 manifest.json 을 원자적으로 기록합니다.
+    새 manifest 에 없는 이전 빌드 파일은 삭제합니다.
+
+    Returns:
+        dict: 기록된 manifest 내용.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written = set()
+
+    manifest = {
+        "version": 1,
+        "sizes": sorted(set(int(s) for s in sizes)),
+        "assets": build_thumbnails(source_dir, out_dir, sizes, written),
+        "sprite": build_sprite_sheet(sprite_dir, out_dir, written) if sprite_dir else None,
+    }
+    tmp_path = out_dir / (MANIFEST_NAME + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, out_dir / MANIFEST_NAME)
+
+    # 이번 빌드에서 참조하지 않는 이전 산출물 정리
+    for old in out_dir.iterdir():
+        if old.is_file() and old.name not in written and old.name != MANIFEST_NAME:
+            old.unlink()
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Another Eden 룰렛 아이콘 에셋 빌드")
+    parser.add_argument("--source", default=str(SOURCE_DIR), help="원본 아이콘 디렉토리")
+    parser.add_argument("--out", default=str(ASSET_OUT_DIR), help="출력 디렉토리")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(THUMBNAIL_SIZES), help="생성할 표시 크기(px)")
+    parser.add_argument("--sprite-source", default=str(SPRITE_SOURCE_DIR), help="스프라이트로 묶을 배지 아이콘 디렉토리")
+    parser.add_argument("--no-sprite", action="store_true", help="스프라이트 시트를 만들지 않음")
+    args = parser.parse_args(argv)
+
+    manifest = build_all(args.source, args.out, args.sizes, None if args.no_sprite else args.sprite_source)
+    src_total = sum(a["source_bytes"] for a in manifest["assets"].values())
+    print(f"아이콘 {len(manifest['assets'])}개 처리 완료 → {args.out}")
+    for size in manifest["sizes"]:
+        best_total = sum(
+            min(f["bytes"] for f in a["variants"][str(size)].values())
+            for a in manifest["assets"].values()
+        )
+        print(f"  {size:>4}px: {best_total / 1024:,.1f} KB (원본 {src_total / 1024:,.1f} KB)")
+    sprite = manifest.get("sprite")
+    if sprite:
+        sprite_bytes = min(f["bytes"] for f in sprite["formats"].values())
+        print(f"  스프라이트: 아이콘 {len(sprite['icons'])}개, {sprite_bytes / 1024:,.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,751 @@
+"""
+아이콘 에셋 처리 모듈.
+Streamlit 세션 간에 공유되는 아이콘 Base64 캐시, 사전 생성된 썸네일/스프라이트 조회,
+대소문자 무시 아이콘 경로 해석, 백그라운드 예열, 정적 URL 서빙 등 이미지 에셋 관련 헬퍼를 제공합니다.
+
+Streamlit 은 메인 스크립트를 매 상호작용마다 다시 실행하지만, import 된 모듈은 프로세스당
+한 번만 로드되므로 이 모듈의 전역 객체는 모든 세션이 함께 사용합니다.
+"""
+import os
+import atexit
+import json
+import base64
+import hashlib
+import itertools
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from functools import lru_cache, partial
+from pathlib import Path
+from queue import Queue, Empty
+
+# 아이콘 캐시 기본 용량 (바이트). 환경변수 EDEN_ICON_CACHE_BYTES 로 조정 가능.
+DEFAULT_ICON_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def _env_int(name: str, default: int) -> int:
+    """환경변수를 정수로 읽되, 없거나 잘못된 값이면 기본값을 반환."""
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class IconCache:
+    """
+    아이콘 파일의 Base64 인코딩 결과를 보관하는 프로세스 공용 LRU 캐시.
+
+    키는 정규화된 절대경로이며, 파일의 mtime 이 저장 당시와 다르면 미스로 처리하고 다시 인코딩합니다.
+    저장된 Base64 문자열 길이의 합이 `max_bytes` 를 넘으면 가장 오래 사용되지 않은 항목부터 제거합니다.
+    미리 인코딩된 결과 공급자(`set_preencoded`, 예: 로스터 스냅샷)가 있으면 미스 시 디스크보다 먼저 조회합니다.
+    여러 세션(스레드)에서 동시에 호출해도 안전합니다.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_ICON_CACHE_BYTES):
+        self.max_bytes = max(0, int(max_bytes))
+        self._entries = OrderedDict()  # key -> (mtime_ns, b64_str)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.current_bytes = 0
+        self.preencoded_hits = 0
+        self._preencoded = None  # .get(key, mtime_ns) -> b64_str | None
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+    def get_base64(self, path: str):
+        """
+        이미지 파일을 Base64 문자열로 반환합니다. 캐시에 있으면 디스크를 읽지 않습니다.
+
+        Args:
+            path (str): 이미지 파일 경로.
+
+        Returns:
+            str | None: Base64 문자열. 파일이 없거나 읽기 실패 시 None.
+        """
+        key = self._key(path)
+        try:
+            mtime_ns = os.stat(key).st_mtime_ns
+        except OSError:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == mtime_ns:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            preencoded = self._preencoded
+
+        # 스냅샷 등에 미리 인코딩된 결과가 있으면 (같은 mtime 일 때만) 그대로 사용
+        if preencoded is not None:
+            b64_str = preencoded.get(key, mtime_ns)
+            if b64_str:
+                with self._lock:
+                    self.preencoded_hits += 1
+                self._store(key, mtime_ns, b64_str)
+                return b64_str
+
+        # 인코딩은 락 밖에서 수행 (동시에 같은 파일을 인코딩해도 결과는 동일)
+        try:
+            with open(key, "rb") as img_file:
+                b64_str = base64.b64encode(img_file.read()).decode()
+        except OSError:
+            return None
+
+        self._store(key, mtime_ns, b64_str)
+        return b64_str
+
+    def _store(self, key: str, mtime_ns: int, b64_str: str):
+        size = len(b64_str)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= len(old[1])
+            if size > self.max_bytes:
+                # 단일 항목이 전체 예산보다 크면 저장하지 않음
+                return
+            self._entries[key] = (mtime_ns, b64_str)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes and self._entries:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.current_bytes -= len(evicted)
+                self.evictions += 1
+
+    def set_preencoded(self, source):
+        """
+        미리 인코딩된 Base64 공급자를 등록합니다. None 이면 해제.
+
+        Args:
+            source: `get(key, mtime_ns)` 메서드를 가진 객체. key 는 정규화된 절대경로이며,
+                    해당 mtime 의 인코딩 결과가 없으면 None 을 반환해야 합니다.
+        """
+        with self._lock:
+            self._preencoded = source
+
+    def clear(self):
+        """모든 항목과 카운터를 초기화합니다."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+            self.hits = self.misses = self.evictions = self.preencoded_hits = 0
+
+    def stats(self) -> dict:
+        """히트/미스/용량 카운터를 딕셔너리로 반환합니다."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "preencoded_hits": self.preencoded_hits,
+                "hit_rate": (self.hits / total) if total else 0.0,
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+# 프로세스 전역 아이콘 캐시 (모든 Streamlit 세션이 공유)
+ICON_CACHE = IconCache(_env_int("EDEN_ICON_CACHE_BYTES", DEFAULT_ICON_CACHE_BYTES))
+
+
+# ─────────────────────────────────────────────
+# 사전 생성된 썸네일(리사이즈/압축) 에셋
+# ─────────────────────────────────────────────
+
+BASE_DIR = Path(__file__).parent.resolve()
+
+# 화면 표시 크기 (px)
+BADGE_ICON_SIZE = 24   # 속성/무기/방어구 배지
+CARD_ICON_SIZE = 50    # 캐릭터 카드 아이콘
+SLOT_ICON_SIZE = 280   # 슬롯머신
+THUMBNAIL_SIZES = (BADGE_ICON_SIZE, CARD_ICON_SIZE, SLOT_ICON_SIZE)
+
+# `build_assets.py` 가 썸네일과 manifest.json 을 기록하는 위치
+ASSET_OUT_DIR = BASE_DIR / "static" / "eden"
+MANIFEST_NAME = "manifest.json"
+
+_MIME_BY_EXT = {".png": "image/png", ".webp": "image/webp", ".gif": "image/gif", ".jpg": "image/jpeg", ".jpeg": "image/jpeg"}
+
+
+def mime_for(path: str) -> str:
+    """파일 확장자로 data URI 용 MIME 타입을 추정합니다."""
+    return _MIME_BY_EXT.get(os.path.splitext(path)[1].lower(), "image/png")
+
+
+def asset_key(path: str) -> str:
+    """manifest 조회용 키: 프로젝트 루트 기준 상대경로 (슬래시 구분, 소문자)."""
+    abs_path = os.path.abspath(path)
+    try:
+        rel = os.path.relpath(abs_path, BASE_DIR)
+    except ValueError:  # 다른 드라이브 (Windows)
+        rel = abs_path
+    return rel.replace("\\", "/").lower()
+
+
+def file_sha1(path: str) -> str:
+    """파일 내용의 SHA-1 해시 (hex)."""
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class AssetManifest:
+    """
+    `build_assets.py` 가 만든 manifest.json 을 읽어, 원본 아이콘에 맞는 가장 작은 썸네일 변형을 찾아줍니다.
+
+    배지 아이콘 스프라이트 시트가 있으면, 아이콘별 CSS 클래스와 그 클래스를 정의하는 스타일 블록도 제공합니다.
+
+    manifest 파일이 바뀌면 자동으로 다시 읽고, 원본 파일 내용(SHA-1)이 빌드 당시와 다르면
+    해당 항목은 무시하여 원본 이미지를 그대로 사용하게 합니다.
+    """
+
+    def __init__(self, out_dir=ASSET_OUT_DIR):
+        self.out_dir = Path(out_dir)
+        self._lock = threading.Lock()
+        self._manifest_mtime = None
+        self._assets = {}
+        self._sprite = None
+        self._sprite_css = None
+        self._fresh = {}  # (abs_path, mtime_ns) -> bool
+        self.base_url = None  # 설정 시 빌드 산출물을 data URI 대신 URL 로 참조
+
+    def set_base_url(self, base_url):
+        """
+        빌드 산출물(`out_dir`)이 서빙되는 기준 URL 을 설정합니다. None 이면 data URI 인라인 모드.
+
+        Args:
+            base_url (str | None): 예) "app/static/eden/" 또는 "http://localhost:8765/".
+        """
+        if base_url and not base_url.endswith("/"):
+            base_url += "/"
+        with self._lock:
+            if base_url != self.base_url:
+                self.base_url = base_url
+                self._sprite_css = None
+
+    def version(self):
+        """manifest 와 URL 모드 설정을 나타내는 토큰 (렌더링 결과 캐시 키에 사용)."""
+        with self._lock:
+            self._reload_if_changed()
+            return (self._manifest_mtime, self.base_url)
+
+    def _reload_if_changed(self):
+        manifest_path = self.out_dir / MANIFEST_NAME
+        try:
+            mtime_ns = manifest_path.stat().st_mtime_ns
+        except OSError:
+            self._manifest_mtime, self._assets, self._sprite, self._sprite_css = None, {}, None, None
+            return
+        if mtime_ns == self._manifest_mtime:
+            return
+        try:
+            with open(manifest_path, encoding="utf-8") as f:
+                data = json.load(f)
+            self._assets = data.get("assets", {})
+            self._sprite = data.get("sprite")
+        except (OSError, ValueError):
+            self._assets, self._sprite = {}, None
+        self._manifest_mtime = mtime_ns
+        self._sprite_css = None
+        self._fresh.clear()
+
+    def _is_fresh(self, abs_path: str, entry: dict, manifest_mtime) -> bool:
+        """
+        원본 파일이 빌드 당시와 같은지 (path, mtime) 단위로 한 번만 확인합니다. 잠금 없이 호출해야 하며,
+        원본 해시는 잠금 밖에서 계산하므로 콜드 스타트에 워밍업 스레드들이 서로를 기다리지 않습니다.
+        그사이 manifest 가 다시 읽혔으면(`manifest_mtime` 변경) 결과를 기억하지 않습니다.
+        """
+        try:
+            mtime_ns = os.stat(abs_path).st_mtime_ns
+        except OSError:
+            return False
+        memo_key = (abs_path, mtime_ns)
+        with self._lock:
+            fresh = self._fresh.get(memo_key)
+        if fresh is None:
+            try:
+                fresh = file_sha1(abs_path) == entry.get("source_sha1")
+            except OSError:
+                fresh = False
+            with self._lock:
+                if self._manifest_mtime == manifest_mtime:
+                    self._fresh[memo_key] = fresh
+        return fresh
+
+    def variant_for(self, path: str, size: int):
+        """
+        표시 크기 `size` 이상인 변형 중 가장 작은 것(같은 크기면 용량이 작은 포맷)을 반환합니다.
+
+        Args:
+            path (str): 원본 아이콘 경로 (절대경로 권장).
+            size (int): 화면 표시 크기 (px).
+
+        Returns:
+            str | None: 썸네일 파일 절대경로. 빌드된 변형이 없거나 오래된 경우 None.
+        """
+        with self._lock:
+            self._reload_if_changed()
+            entry = self._assets.get(asset_key(path))
+            manifest_mtime = self._manifest_mtime
+        if not entry or not self._is_fresh(os.path.abspath(path), entry, manifest_mtime):
+            return None
+        variants = entry.get("variants", {})
+        sizes = sorted(int(s) for s in variants)
+        if not sizes:
+            return None
+        chosen = next((s for s in sizes if s >= size), sizes[-1])
+        formats = variants[str(chosen)]
+        best = min(formats.values(), key=lambda v: v.get("bytes", 0))
+        candidate = self.out_dir / best["file"]
+        return str(candidate) if candidate.exists() else None
+
+    def url_for(self, path: str, size: int):
+        """
+        정적 URL 모드에서 `variant_for` 로 고른 썸네일의 URL 을 반환합니다.
+        URL 모드가 아니거나 빌드된 변형이 없으면 None (호출 측은 data URI 로 대체).
+        """
+        base_url = self.base_url
+        if not base_url:
+            return None
+        variant = self.variant_for(path, size)
+        return base_url + os.path.basename(variant) if variant else None
+
+
+    def sprite_class(self, path: str):
+        """
+        배지 아이콘이 스프라이트 시트에 포함되어 있으면 CSS 클래스명을 반환합니다.
+
+        Returns:
+            str | None: 예) "eden-sprite eden-ico-3". 스프라이트가 없거나 원본이 바뀌었으면 None.
+        """
+        with self._lock:
+            self._reload_if_changed()
+            sprite = self._sprite
+            entry = sprite["icons"].get(asset_key(path)) if sprite else None
+            manifest_mtime = self._manifest_mtime
+        if not entry or not self._is_fresh(os.path.abspath(path), entry, manifest_mtime):
+            return None
+        return f"eden-sprite eden-ico-{entry['index']}"
+
+    def sprite_css(self, display_size: int = BADGE_ICON_SIZE) -> str:
+        """
+        스프라이트 시트를 한 번만 포함하고 아이콘별 클래스를 정의하는 CSS 를 반환합니다.
+        그리드의 <style> 블록에 한 번 넣으면, 카드 수와 관계없이 배지 이미지는 한 번만 전송됩니다.
+
+        Args:
+            display_size (int): 배지 표시 크기 (px).
+
+        Returns:
+            str: CSS 문자열. 스프라이트가 없으면 빈 문자열.
+        """
+        with self._lock:
+            self._reload_if_changed()
+            if self._sprite_css is not None and self._sprite_css[0] == display_size:
+                return self._sprite_css[1]
+            sprite = self._sprite
+        if not sprite:
+            return ""
+
+        best = min(sprite["formats"].values(), key=lambda v: v.get("bytes", 0))
+        atlas_path = str(self.out_dir / best["file"])
+        base_url = self.base_url
+        if base_url:
+            atlas_src = base_url + best["file"]
+        else:
+            b64_str = ICON_CACHE.get_base64(atlas_path)
+            if not b64_str:
+                return ""
+            atlas_src = f"data:{mime_for(atlas_path)};base64,{b64_str}"
+
+        scale = display_size / sprite["cell"]
+        step = sprite["cell"] * scale
+        rules = [
+            f".eden-sprite {{ display: inline-block; width: {display_size}px; height: {display_size}px; "
+            f"background-image: url({atlas_src}); background-repeat: no-repeat; "
+            f"background-size: {sprite['columns'] * step:g}px {sprite['rows'] * step:g}px; }}"
+        ]
+        offset = lambda n: f"{-n * step:g}px" if n else "0"
+        for entry in sorted(sprite["icons"].values(), key=lambda e: e["index"]):
+            rules.append(f".eden-ico-{entry['index']} {{ background-position: {offset(entry['col'])} {offset(entry['row'])}; }}")
+        css = "\n".join(rules)
+        with self._lock:
+            self._sprite_css = (display_size, css)
+        return css
+
+
+# 프로세스 전역 썸네일/스프라이트 manifest
+ASSET_MANIFEST = AssetManifest()
+
+
+# ─────────────────────────────────────────────
+# 아이콘 경로 해석 (대소문자 무시, 사전 스캔)
+# ─────────────────────────────────────────────
+
+ICON_ROOT_DIR = BASE_DIR / "character_art"
+
+# 디렉토리 변경 여부(mtime)를 다시 확인하는 최소 간격 (초)
+RESOLVER_CHECK_INTERVAL_S = 2.0
+
+
+def normalize_icon_path(path) -> str:
+    """CSV 아이콘 경로 정리: NFKC, 역슬래시 → 슬래시, BOM/NBSP/앞뒤 공백 제거."""
+    path = unicodedata.normalize("NFKC", str(path or ""))
+    return path.replace("\\", "/").strip().lstrip("\ufeff").replace("\u00A0", "")
+
+
+class AssetResolver:
+    """
+    `root` 아래 파일을 한 번 스캔해 (프로젝트 루트 기준 소문자 상대경로 → 실제 절대경로) 표를 만들어 두고,
+    CSV 의 아이콘 경로를 대소문자 구분 없이 표 조회만으로 실제 파일에 연결합니다.
+
+    디렉토리와 파일의 mtime 을 `check_interval` 초마다 확인하여 파일이 추가/삭제/이름 변경되거나
+    같은 경로에서 내용이 교체되면 다시 스캔하며, 그때마다 `version()` 이 바뀝니다. 여러 세션(스레드)에서 동시에 호출해도 안전합니다.
+    """
+
+    def __init__(self, root=ICON_ROOT_DIR, base_dir=BASE_DIR, check_interval: float = RESOLVER_CHECK_INTERVAL_S):
+        self.root = Path(root)
+        self.base_dir = Path(base_dir)
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._files = {}       # 소문자 상대경로 -> 실제 절대경로
+        self._dir_mtimes = {}  # 스캔한 디렉토리 -> mtime_ns
+        self._file_mtimes = {}  # 스캔한 파일 -> mtime_ns (제자리 교체는 디렉토리 mtime 을 바꾸지 않음)
+        self._memo = {}        # 원본 문자열 -> 해석 결과 (None 포함)
+        self._checked_at = None
+        self._version = 0
+        self.errors = []       # 마지막 스캔 중 읽지 못한 디렉토리 [(경로, 예외)]
+
+    def _key(self, path: str) -> str:
+        """프로젝트 루트 기준 소문자 상대경로 (루트 밖이면 None)."""
+        try:
+            rel = os.path.relpath(os.path.abspath(path), self.base_dir)
+        except ValueError:  # 다른 드라이브 (Windows)
+            return None
+        if rel == ".." or rel.startswith(".." + os.sep):
+            return None
+        return rel.replace("\\", "/").lower()
+
+    def _scan(self):
+        files, dir_mtimes, file_mtimes, errors = {}, {}, {}, []
+        for dir_path, _, file_names in os.walk(self.root, onerror=lambda e: errors.append((e.filename, e))):
+            try:
+                dir_mtimes[dir_path] = os.stat(dir_path).st_mtime_ns
+            except OSError as e:
+                errors.append((dir_path, e))
+                continue
+            for name in file_names:
+                full = os.path.join(dir_path, name)
+                try:
+                    file_mtimes[full] = os.stat(full).st_mtime_ns
+                except OSError:
+                    continue
+                key = self._key(full)
+                if key is not None:
+                    files.setdefault(unicodedata.normalize("NFKC", key), full)
+        self._files, self._dir_mtimes, self._file_mtimes, self.errors = files, dir_mtimes, file_mtimes, errors
+        self._memo = {}
+        self._version += 1
+
+    def _changed(self) -> bool:
+        if not self._dir_mtimes:
+            return True
+        for path, mtime_ns in itertools.chain(self._dir_mtimes.items(), self._file_mtimes.items()):
+            try:
+                if os.stat(path).st_mtime_ns != mtime_ns:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def refresh(self, force: bool = False):
+        """디렉토리가 바뀌었으면(또는 `force`) 다시 스캔합니다. 확인은 `check_interval` 초에 한 번만."""
+        now = time.monotonic()
+        with self._lock:
+            if not force and self._checked_at is not None and now - self._checked_at < self.check_interval:
+                return
+            self._checked_at = now
+            if force or self._changed():
+                self._scan()
+
+    def version(self) -> int:
+        """스캔 결과 버전 (다시 스캔할 때마다 증가, 렌더링 결과 캐시 키에 사용)."""
+        self.refresh()
+        return self._version
+
+    def resolve(self, path):
+        """
+        CSV 아이콘 경로를 실제 파일의 절대경로로 변환합니다.
+
+        Args:
+            path (str): CSV 에 적힌 경로 (상대/절대, 대소문자 불일치 허용). URL·data URI 는 그대로 반환.
+
+        Returns:
+            str | None: 실제 파일 경로 (또는 URL). 비어 있거나 파일이 없으면 None.
+        """
+        self.refresh()
+        memo = self._memo
+        if path in memo:
+            return memo[path]
+        clean = normalize_icon_path(path)
+        if not clean:
+            result = None
+        elif clean.startswith(("http://", "https://", "data:image")):
+            result = clean
+        else:
+            full = clean if os.path.isabs(clean) else os.path.join(self.base_dir, clean.lstrip("/\\"))
+            key = self._key(full)
+            result = self._files.get(key) if key is not None else None
+            # 스캔 범위 밖의 경로는 파일 시스템에 직접 확인 (대소문자 그대로)
+            if result is None and (key is None or not key.startswith(self._key(str(self.root)) + "/")):
+                result = full if os.path.isfile(full) else None
+        memo[path] = result
+        return result
+
+    def lookup(self, path):
+        """
+        외부 입력(HTTP 요청 경로 등)용 조회: 스캔된 파일 표에서만 찾고 결과를 기억하지 않습니다.
+        `resolve` 는 CSV 의 유한한 경로 목록을 위해 결과를 기억하므로, 임의의 문자열을 넣으면 메모리가 계속 늘어납니다.
+
+        Returns:
+            str | None: `root` 아래 실제 파일 경로. 없으면 None (URL·data URI·`root` 밖 경로도 None).
+        """
+        self.refresh()
+        clean = normalize_icon_path(path)
+        if not clean or clean.startswith(("http://", "https://", "data:image")):
+            return None
+        full = clean if os.path.isabs(clean) else os.path.join(self.base_dir, clean.lstrip("/\\"))
+        key = self._key(full)
+        return self._files.get(key) if key is not None else None
+
+    def missing(self, paths) -> list:
+        """`paths` 중 실제 파일을 찾지 못한 경로 목록 (빈 값 제외, 정렬)."""
+        return sorted({p for p in paths if normalize_icon_path(p) and self.resolve(p) is None})
+
+
+# 프로세스 전역 아이콘 경로 해석기 (모든 Streamlit 세션이 공유)
+ASSET_RESOLVER = AssetResolver()
+
+
+# ─────────────────────────────────────────────
+# 아이콘 예열 (백그라운드 Base64 인코딩)
+# ─────────────────────────────────────────────
+
+# 예열 스레드 수 기본값. 환경변수 EDEN_WARMUP_WORKERS 로 조정 가능.
+DEFAULT_WARMUP_WORKERS = min(8, os.cpu_count() or 2)
+
+
+def warm_icon(path: str, size: int = None) -> bool:
+    """
+    CSV 아이콘 경로 하나를 해석하고 (size 가 있으면 해당 크기 썸네일로) `ICON_CACHE` 에 인코딩해 둡니다.
+
+    Returns:
+        bool: 파일을 찾아 캐시에 올렸으면(또는 URL 이면) True.
+    """
+    resolved = ASSET_RESOLVER.resolve(path)
+    if resolved is None or resolved.startswith(("http://", "https://", "data:")):
+        return resolved is not None
+    if size:
+        resolved = ASSET_MANIFEST.variant_for(resolved, size) or resolved
+    return ICON_CACHE.get_base64(resolved) is not None
+
+
+class _WarmupJob:
+    def __init__(self, key, jobs: list):
+        self.key = key
+        self.queue = Queue()
+        for job in jobs:
+            self.queue.put(job)
+        self.total = len(jobs)
+        self.done = 0
+        self.failed = 0
+        self.active = 0
+        self.started_at = time.time()
+        self.finished_at = None
+        self.stop_event = threading.Event()
+
+
+class IconWarmup:
+    """
+    CSV 가 참조하는 아이콘들을 백그라운드 스레드 풀에서 미리 인코딩해 `ICON_CACHE` 를 채웁니다.
+    파일 읽기·Base64 인코딩은 I/O 위주라 스레드로 충분하며, 썸네일 리사이즈는 `build_assets.py` 가 미리 해 둡니다.
+
+    같은 키(CSV·에셋 버전)로 다시 `start` 하면 무시하고, 키가 바뀌면 진행 중인 작업을 멈추고 새로 시작합니다.
+    작업 스레드는 데몬 스레드이며 항목마다 중지 신호를 확인하므로, `stop()` 이나 프로세스 종료 시 바로 끝납니다.
+    """
+
+    def __init__(self, workers: int = None):
+        self.workers = max(1, workers or _env_int("EDEN_WARMUP_WORKERS", DEFAULT_WARMUP_WORKERS))
+        self._lock = threading.Lock()
+        self._job = None
+        self._threads = []
+
+    def start(self, key, jobs) -> bool:
+        """
+        예열을 시작합니다.
+
+        Args:
+            key: 작업 식별 키 (예: (CSV 경로, 데이터 버전, 에셋 버전)).
+            jobs: (CSV 아이콘 경로, 표시 크기 또는 None) 목록, 또는 그 목록을 반환하는 함수.
+                  함수를 주면 같은 키의 작업이 이미 있을 때 호출하지 않으므로 매 실행마다 목록을 만들지 않습니다.
+
+        Returns:
+            bool: 새 작업을 시작했으면 True, 같은 키의 작업이 이미 있으면 False.
+        """
+        with self._lock:
+            if self._job is not None and self._job.key == key:
+                return False
+        jobs = list(jobs() if callable(jobs) else jobs)
+        with self._lock:  # 목록을 만드는 사이 다른 세션이 같은 키로 시작했을 수 있음
+            if self._job is not None and self._job.key == key:
+                return False
+        self.stop()
+        job = _WarmupJob(key, jobs)
+        count = min(self.workers, job.total)
+        job.active = count
+        if count == 0:
+            job.finished_at = time.time()
+        threads = [
+            threading.Thread(target=self._run, args=(job,), name=f"eden-icon-warmup-{i}", daemon=True)
+            for i in range(count)
+        ]
+        with self._lock:
+            self._job, self._threads = job, threads
+        for thread in threads:
+            thread.start()
+        return True
+
+    def _run(self, job: _WarmupJob):
+        while not job.stop_event.is_set():
+            try:
+                path, size = job.queue.get_nowait()
+            except Empty:
+                break
+            try:
+                ok = warm_icon(path, size)
+            except Exception:
+                ok = False
+            with self._lock:
+                job.done += 1
+                job.failed += 0 if ok else 1
+        with self._lock:
+            job.active -= 1
+            if job.active == 0 and job.finished_at is None:
+                job.finished_at = time.time()
+
+    def stop(self, timeout: float = 5.0):
+        """진행 중인 예열을 멈추고 작업 스레드가 끝날 때까지 (최대 timeout 초) 기다립니다."""
+        with self._lock:
+            job, threads = self._job, self._threads
+            self._threads = []
+        if job is not None:
+            job.stop_event.set()
+        for thread in threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout)
+
+    def progress(self) -> dict:
+        """
+        현재(또는 마지막) 작업의 진행 상황.
+
+        Returns:
+            dict: {"running", "total", "done", "failed", "elapsed_s"}. 작업이 없으면 running False, total 0.
+        """
+        with self._lock:
+            job = self._job
+            if job is None:
+                return {"running": False, "total": 0, "done": 0, "failed": 0, "elapsed_s": 0.0}
+            end = job.finished_at or time.time()
+            return {
+                "running": job.finished_at is None and not job.stop_event.is_set(),
+                "total": job.total,
+                "done": job.done,
+                "failed": job.failed,
+                "elapsed_s": end - job.started_at,
+            }
+
+
+# 프로세스 전역 아이콘 예열기 (프로세스 종료 시 중지)
+ICON_WARMUP = IconWarmup()
+atexit.register(ICON_WARMUP.stop, 1.0)
+
+
+# ─────────────────────────────────────────────
+# 정적 에셋 서버 (URL 모드용 내장 서버)
+# ─────────────────────────────────────────────
+
+# 내용 해시가 붙은 파일은 내용이 바뀌면 이름도 바뀌므로 사실상 영구 캐시해도 안전
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@lru_cache(maxsize=None)
+def _static_handler_class():
+    """
+    빌드 산출물을 장기 캐시 헤더와 함께 서빙하는 핸들러 클래스.
+    http.server(email 패키지 등 포함)는 import 비용이 커서, 정적 서버를 실제로 켤 때만 불러옵니다.
+    """
+    from http.server import SimpleHTTPRequestHandler
+
+    class _StaticAssetHandler(SimpleHTTPRequestHandler):
+        def end_headers(self):
+            if self.path.rstrip("/").endswith(MANIFEST_NAME):
+                self.send_header("Cache-Control", "no-cache")
+            else:
+                self.send_header("Cache-Control", IMMUTABLE_CACHE_CONTROL)
+            self.send_header("Access-Control-Allow-Origin", "*")
+            super().end_headers()
+
+        def list_directory(self, path):
+            self.send_error(404)
+            return None
+
+        def log_message(self, format, *args):
+            pass
+
+    return _StaticAssetHandler
+
+
+_static_server = None
+_static_server_lock = threading.Lock()
+
+
+def start_static_server(host: str = "127.0.0.1", port: int = 8765, directory=ASSET_OUT_DIR, public_host: str = None):
+    """
+    `directory` 를 서빙하는 내장 HTTP 서버를 백그라운드 스레드로 시작합니다 (프로세스당 1회).
+    운영 환경에서는 같은 디렉토리를 서빙하는 CDN/리버스 프록시 URL 을 대신 사용하면 됩니다.
+
+    Args:
+        host (str): 바인딩 주소.
+        port (int): 포트. 0 이면 임의의 빈 포트.
+        directory: 서빙할 디렉토리.
+        public_host (str, optional): 브라우저가 접속할 호스트 이름. 없으면 바인딩 주소를 그대로 사용합니다.
+
+    Returns:
+        str | None: 서버 기준 URL. 디렉토리가 없거나 포트를 열 수 없으면 None.
+    """
+    global _static_server
+    with _static_server_lock:
+        if _static_server is None:
+            if not Path(directory).is_dir():
+                return None
+            from http.server import ThreadingHTTPServer
+
+            handler = partial(_static_handler_class(), directory=str(directory))
+            try:
+                server = ThreadingHTTPServer((host, port), handler)
+            except OSError:
+                return None
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, name="eden-static-assets", daemon=True).start()
+            _static_server = server
+        bound_host, bound_port = _static_server.server_address[:2]
+        return f"http://{public_host or bound_host}:{bound_port}/"
+
@@ -0,0 +1,688 @@
+"""
+캐릭터 데이터 인덱스 모듈.
+CSV 로부터 읽은 캐릭터 표를 한 번만 정규화하고, 필터/사이드바에 필요한 값들을 미리 계산해 둡니다.
+필터링은 미리 계산된 값별 bool 마스크의 벡터화된 AND/OR 연산으로 수행하며 (`FilterEngine`),
+자주 쓰이는 필터 결과와 카드 HTML 조각은 프로세스 공용 캐시에 보관합니다
+(`FILTER_CACHE`, `CARD_FRAGMENT_CACHE`). CSV 가 바뀌면 `ROSTER_STORE` 가 바뀐 행만 반영한 새 인덱스로 교체합니다.
+
+Streamlit 에 의존하지 않으므로 헤드리스 스크립트(벤치마크, API 서버 등)에서도 그대로 사용할 수 있습니다.
+"""
+import os
+import re
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from eden_search import NameSearchIndex
+
+# 리스트형 컬럼('속성명리스트' 등)의 구분자
+LIST_SPLIT_RE = re.compile('[|,]')
+
+# 무기 명칭 교정 (원본 데이터 표기 → 앱 표기)
+WEAPON_RENAMES = {'주먹': '권갑'}
+
+# 앱 컬럼명(한글) → CSV 컬럼명 기본 매핑
+DEFAULT_COLUMN_MAP = {
+    '희귀도': '희귀도', '이름': '캐릭터명', '캐릭터아이콘경로': '캐릭터아이콘경로',
+    '속성명': '속성명리스트', '속성아이콘': '속성_아이콘경로리스트',
+    '무기명': '무기명리스트', '무기아이콘': '무기_아이콘경로리스트',
+    '방어구명': '방어구명리스트', '방어구아이콘': '방어구_아이콘경로리스트',
+}
+
+# 인덱스를 만드는 필터 대상 컬럼 (COLUMN_MAP 의 키)
+FACET_KEYS = ('희귀도', '속성명', '무기명', '방어구명')
+
+# 아이콘 경로 컬럼 (COLUMN_MAP 의 키). 배지 아이콘 컬럼은 '|' / ',' 로 구분된 목록
+ICON_KEYS = ('캐릭터아이콘경로', '속성아이콘', '무기아이콘', '방어구아이콘')
+
+# 출시일 컬럼 (CSV 에 있으면 룰렛 최신 우대 가중치에 사용)
+RELEASE_COL = '출시일'
+
+
+def split_list(val) -> list:
+    """'불,수정' / '불|수정' 형태의 문자열을 공백 제거된 리스트로 변환."""
+    if isinstance(val, str) and val:
+        return [item.strip() for item in LIST_SPLIT_RE.split(val) if item.strip()]
+    return []
+
+
+def normalize_rarity(val: str) -> str:
+    """성급(희귀도) 정규화: 복수 표기 시 최고 성급만 남기기. 예) '4~5★ SA' → '5★ SA'"""
+    if not isinstance(val, str):
+        return val
+    val = val.strip()
+    if not val:
+        return val
+    # SA 여부
+    has_sa = 'SA' in val
+    # 모든 숫자 추출
+    nums = re.findall(r'(\d)(?=★)', val)
+    if nums:
+        max_star = max(int(n) for n in nums)
+        return f"{max_star}★{' SA' if has_sa else ''}"
+    return val
+
+
+def csv_version(csv_path: str):
+    """
+    CSV 파일의 버전 키 (mtime_ns, 크기). 캐시 키로 사용하며, 파일이 없으면 None.
+    """
+    try:
+        st_ = os.stat(csv_path)
+    except OSError:
+        return None
+    return (st_.st_mtime_ns, st_.st_size)
+
+
+def normalize_frame(df: pd.DataFrame, column_map: dict) -> pd.DataFrame:
+    """
+    CSV 표에 앱 표기 규칙을 적용한 사본을 반환합니다.
+    무기 명칭 교정('주먹' → '권갑')과 희귀도 정규화(복수 표기 시 최고 성급만)를 수행합니다.
+    """
+    df = df.reset_index(drop=True).copy()
+
+    # ── 명칭 교정: '주먹' → '권갑' ──
+    weapon_col = column_map['무기명']
+    if weapon_col in df.columns:
+        weapons = df[weapon_col].astype(str)
+        for old, new in WEAPON_RENAMES.items():
+            weapons = weapons.str.replace(old, new, regex=False)
+        df[weapon_col] = weapons
+
+    # ── 성급(희귀도) 정규화: 복수 표기 시 최고 성급만 남기기 ──
+    rarity_col = column_map['희귀도']
+    if rarity_col in df.columns:
+        df[rarity_col] = [normalize_rarity(v) for v in df[rarity_col].astype(str)]
+    return df
+
+
+def release_days_of(df: pd.DataFrame) -> np.ndarray:
+    """출시일 컬럼을 1970-01-01 기준 일수 배열로 변환 (컬럼이 없거나 날짜가 아니면 NaN)."""
+    if RELEASE_COL not in df.columns:
+        return np.full(len(df), np.nan)
+    released = pd.to_datetime(df[RELEASE_COL], errors='coerce')
+    return ((released - pd.Timestamp('1970-01-01')) / pd.Timedelta(days=1)).to_numpy(dtype=float, na_value=np.nan)
+
+
+def row_fingerprints(df: pd.DataFrame) -> list:
+    """
+    행 내용의 64비트 해시(int) 목록. 로스터 갱신 시 바뀐 행을 찾고 카드 HTML 조각 캐시 키로 사용합니다.
+    프로세스와 무관하게 같은 값이므로 스냅샷에 저장해 두고 재사용할 수 있습니다.
+    """
+    columns = [df[c].astype(str).tolist() for c in df.columns]
+    blake2b = hashlib.blake2b
+    return [
+        int.from_bytes(blake2b('\x1f'.join(values).encode('utf-8'), digest_size=8).digest(), 'little')
+        for values in zip(*columns)
+    ]
+
+
+class Facet:
+    """
+    필터 대상 컬럼 하나에 대한 사전 계산 결과.
+
+    Attributes:
+        values (list[str]): 정렬된 고유값 목록 (사이드바 multiselect 옵션).
+        membership (np.ndarray): (행 수, 고유값 수) bool 행렬. [i, j] 는 i번째 캐릭터가 values[j] 를 가지는지 여부.
+        codes (np.ndarray): 행별 첫 번째 값의 코드 (values 의 인덱스, 값이 없으면 -1).
+    """
+
+    def __init__(self, row_lists: list):
+        self.values = sorted({v for items in row_lists for v in items})
+        position = {v: j for j, v in enumerate(self.values)}
+        self.membership = np.zeros((len(row_lists), len(self.values)), dtype=bool)
+        self.codes = np.full(len(row_lists), -1, dtype=np.int32)
+        for i, items in enumerate(row_lists):
+            for v in items:
+                self.membership[i, position[v]] = True
+            if items:
+                self.codes[i] = position[items[0]]
+
+    @classmethod
+    def from_arrays(cls, values: list, membership: np.ndarray, codes: np.ndarray) -> 'Facet':
+        """미리 계산된 값 목록과 배열로 Facet 을 복원합니다 (스냅샷 로드용)."""
+        facet = cls.__new__(cls)
+        facet.values = list(values)
+        facet.membership = membership
+        facet.codes = codes
+        return facet
+
+    def encode_lists(self, row_lists: list) -> tuple:
+        """
+        행별 값 리스트를 (값 코드 배열, 행별 시작 위치 배열) 로 변환 (저장용, 행 안의 순서 유지).
+        i번째 행의 코드는 codes[offsets[i]:offsets[i + 1]].
+        """
+        position = {v: j for j, v in enumerate(self.values)}
+        codes = np.fromiter((position[v] for items in row_lists for v in items), dtype=np.int32)
+        offsets = np.zeros(len(row_lists) + 1, dtype=np.int64)
+        np.cumsum([len(items) for items in row_lists], out=offsets[1:])
+        return codes, offsets
+
+    def decode_lists(self, codes, offsets) -> list:
+        """`encode_lists` 결과를 행별 값 리스트로 되돌립니다."""
+        values = self.values
+        flat = [values[c] for c in np.asarray(codes).tolist()]
+        offsets = np.asarray(offsets).tolist()
+        return [flat[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+    def updated(self, row_lists: list, reused_new: np.ndarray, reused_old: np.ndarray, fresh_rows: list) -> 'Facet':
+        """
+        일부 행만 바뀐 로스터용 새 Facet. 재사용 행의 bool 행렬·코드는 기존 값을 열 위치만 맞춰 옮기고,
+        `fresh_rows` 의 행만 `row_lists` 로부터 채웁니다.
+
+        Args:
+            row_lists (list): 새 로스터의 행별 값 리스트.
+            reused_new, reused_old (np.ndarray): 재사용 행의 (새 행 번호, 기존 행 번호).
+            fresh_rows (list): 새로 계산할 행 번호.
+        """
+        old_membership = np.asarray(self.membership)
+        present = old_membership[reused_old].any(axis=0) if len(reused_old) else np.zeros(len(self.values), dtype=bool)
+        values = {v for v, keep in zip(self.values, present) if keep}
+        values.update(v for i in fresh_rows for v in row_lists[i])
+
+        facet = Facet.__new__(Facet)
+        facet.values = sorted(values)
+        position = {v: j for j, v in enumerate(facet.values)}
+        facet.membership = np.zeros((len(row_lists), len(facet.values)), dtype=bool)
+        facet.codes = np.full(len(row_lists), -1, dtype=np.int32)
+
+        # 재사용 행: 기존 열 → 새 열 위치로 한 번에 복사
+        old_cols = [j for j, v in enumerate(self.values) if v in position]
+        new_cols = [position[self.values[j]] for j in old_cols]
+        if len(reused_new) and old_cols:
+            facet.membership[np.ix_(reused_new, new_cols)] = old_membership[np.ix_(reused_old, old_cols)]
+            remap = np.full(len(self.values) + 1, -1, dtype=np.int32)  # 마지막 칸은 코드 -1 용
+            remap[old_cols] = new_cols
+            facet.codes[reused_new] = remap[np.asarray(self.codes)[reused_old]]
+
+        for i in fresh_rows:
+            items = row_lists[i]
+            for v in items:
+                facet.membership[i, position[v]] = True
+            if items:
+                facet.codes[i] = position[items[0]]
+        return facet
+
+    def mask(self, value: str) -> np.ndarray:
+        """해당 값을 가진 행의 bool 마스크 (없는 값이면 전부 False)."""
+        try:
+            return self.membership[:, self.values.index(value)]
+        except ValueError:
+            return np.zeros(self.membership.shape[0], dtype=bool)
+
+
+class RosterDiff:
+    """
+    두 로스터 버전의 캐릭터명 기준 차이.
+
+    Attributes:
+        added (list[str]): 새로 생긴 캐릭터.
+        removed (list[str]): 없어진 캐릭터.
+        changed (list[str]): 이름은 같고 내용이 바뀐 캐릭터.
+        stale_fingerprints (set): 더 이상 쓰이지 않는 기존 행의 내용 해시 (카드 조각 캐시 정리용).
+    """
+
+    def __init__(self, added=(), removed=(), changed=(), stale_fingerprints=()):
+        self.added = list(added)
+        self.removed = list(removed)
+        self.changed = list(changed)
+        self.stale_fingerprints = set(stale_fingerprints)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def summary(self) -> str:
+        """사람이 읽을 요약. 예) '추가 1, 변경 2, 삭제 0 (레이븐 AS, ...)'"""
+        names = self.added + self.changed + self.removed
+        preview = ", ".join(names[:5]) + (" ..." if len(names) > 5 else "")
+        text = f"추가 {len(self.added)}, 변경 {len(self.changed)}, 삭제 {len(self.removed)}"
+        return f"{text} ({preview})" if names else text
+
+
+class CharacterIndex:
+    """
+    CSV 한 버전에 대해 한 번만 만들어지는 정규화된 캐릭터 인덱스.
+
+    - 무기 명칭 교정('주먹' → '권갑')과 희귀도 정규화를 적용한 DataFrame (`df`)
+    - 희귀도/속성/무기/방어구 컬럼별 `Facet` (고유값 목록, 행×값 bool 행렬)
+    - 리스트형 컬럼을 미리 분리해 둔 행별 리스트 (`lists`)
+    - 출시일을 1970-01-01 기준 일수로 바꾼 배열 (`release_days`, 없으면 NaN)
+    - 한글명·영문 별칭·초성 이름 검색 인덱스 (`search`)
+    - 행 내용 해시 (`fingerprints`, 로스터 갱신 비교·카드 조각 캐시 키)
+
+    CSV 가 바뀌면 `apply_update` 로 바뀐 행만 다시 계산한 새 인덱스를 만들 수 있습니다.
+    생성 후에는 읽기 전용으로 취급하며, 여러 세션이 같은 객체를 공유합니다.
+    """
+
+    def __init__(self, df: pd.DataFrame, column_map: dict, aliases: dict = None):
+        self.column_map = dict(column_map)
+        df = normalize_frame(df, self.column_map)
+        self._set_frame(df)
+        # 이름 검색용 (aliases: {한글 캐릭터명: [영문명, ...]}, eden_search.load_name_aliases)
+        self.search = NameSearchIndex(self.names, aliases)
+        self.release_days = release_days_of(df)
+        self.lists = {key: self._row_lists(key) for key in FACET_KEYS}
+        self.facets = {key: Facet(self.lists[key]) for key in FACET_KEYS}
+
+    @classmethod
+    def from_prepared(cls, df: pd.DataFrame, column_map: dict, facets: dict, release_days: np.ndarray,
+                      lists: dict, fingerprints: list, search: NameSearchIndex) -> 'CharacterIndex':
+        """
+        이미 정규화된 DataFrame 과 미리 계산된 값들로 인덱스를 만듭니다.
+        정규화·리스트 분리·Facet·검색 키·행 해시 계산을 다시 하지 않습니다 (`eden_snapshot` 로드용).
+
+        Args:
+            df (pd.DataFrame): `CharacterIndex.df` 와 같은 형태의 정규화된 표.
+            column_map (dict): 컬럼 이름 매핑.
+            facets (dict): {FACET_KEYS 의 키: Facet}.
+            release_days (np.ndarray): 행별 출시일 (1970-01-01 기준 일수, 없으면 NaN).
+            lists (dict): {FACET_KEYS 의 키: 행별 값 리스트}.
+            fingerprints (list): 행별 내용 해시 (`row_fingerprints`).
+            search (NameSearchIndex): 이름 검색 인덱스.
+        """
+        index = cls.__new__(cls)
+        index.column_map = dict(column_map)
+        index._set_frame(df.reset_index(drop=True), fingerprints)
+        index.search = search
+        index.release_days = release_days
+        index.lists = {key: lists[key] for key in FACET_KEYS}
+        index.facets = {key: facets[key] for key in FACET_KEYS}
+        return index
+
+    def _set_frame(self, df: pd.DataFrame, fingerprints: list = None):
+        self.df = df
+        self.names = df[self.column_map['이름']].astype(str).to_numpy()
+        self.fingerprints = row_fingerprints(df) if fingerprints is None else fingerprints
+
+    def _row_lists(self, key: str, rows=None) -> list:
+        """필터 대상 컬럼을 행별 값 리스트로 분리 (희귀도는 단일 값). `rows` 를 주면 해당 행만."""
+        values = self.df[self.column_map[key]]
+        if rows is not None:
+            values = values.iloc[rows]
+        if key == '희귀도':
+            return [[v] if v else [] for v in values.astype(str)]
+        return [split_list(v) for v in values]
+
+    def apply_update(self, df: pd.DataFrame, aliases: dict = None) -> tuple:
+        """
+        새 CSV 표를 캐릭터명 기준으로 비교해, 바뀐 행만 다시 계산한 새 인덱스를 만듭니다.
+
+        행 순서는 새 표를 따르며, 이름과 내용이 그대로인 행은 이름 검색 키·Facet 값·출시일을 기존 인덱스에서
+        가져오고 추가/변경된 행만 새로 계산합니다. 기존 인덱스는 변경하지 않으므로 다른 세션이 계속 사용해도 안전합니다.
+
+        Args:
+            df (pd.DataFrame): 새로 읽은 CSV 표 (정규화 전).
+            aliases (dict, optional): 이름 검색용 영문 별칭 (기존 인덱스와 같은 것이어야 함).
+
+        Returns:
+            tuple: (CharacterIndex, RosterDiff). 바뀐 것이 없으면 (self, 빈 RosterDiff).
+        """
+        new_df = normalize_frame(df, self.column_map)
+        fingerprints = row_fingerprints(new_df)
+        new_names = new_df[self.column_map['이름']].astype(str).to_numpy()
+
+        # 이름과 내용이 같은 행을 먼저 짝짓고(중복 이름 허용), 남은 행은 이름별로 변경/추가/삭제로 분류
+        old_rows = {}
+        for row_id, key in enumerate(zip(self.names, self.fingerprints)):
+            old_rows.setdefault(key, []).append(row_id)
+        reuse, unmatched_new = {}, {}
+        for row_id, key in enumerate(zip(new_names, fingerprints)):
+            rows = old_rows.get(key)
+            if rows:
+                reuse[row_id] = rows.pop(0)
+            else:
+                unmatched_new.setdefault(key[0], []).append(row_id)
+        unmatched_old = {}
+        for (name, _), rows in old_rows.items():
+            unmatched_old.setdefault(name, []).extend(rows)
+        added, removed, changed = [], [], []
+        for name in dict.fromkeys([*unmatched_new, *unmatched_old]):
+            new_count, old_count = len(unmatched_new.get(name, ())), len(unmatched_old.get(name, ()))
+            changed += [name] * min(new_count, old_count)
+            added += [name] * max(new_count - old_count, 0)
+            removed += [name] * max(old_count - new_count, 0)
+        diff = RosterDiff(added, removed, changed,
+                          {self.fingerprints[row] for rows in unmatched_old.values() for row in rows})
+        same_layout = list(new_df.columns) == list(self.df.columns) and len(new_df) == len(self.df)
+        if not diff and same_layout and all(reuse.get(i) == i for i in range(len(new_df))):
+            return self, diff
+
+        index = CharacterIndex.__new__(CharacterIndex)
+        index.column_map = self.column_map
+        index.df = new_df
+        index.names = new_names
+        index.fingerprints = fingerprints
+        index.search = self.search.updated(new_names, reuse, aliases)
+
+        fresh_rows = [i for i in range(len(new_df)) if i not in reuse]
+        reused_new = np.fromiter(reuse.keys(), dtype=np.intp, count=len(reuse))
+        reused_old = np.fromiter(reuse.values(), dtype=np.intp, count=len(reuse))
+
+        index.release_days = np.empty(len(new_df), dtype=float)
+        index.release_days[reused_new] = np.asarray(self.release_days)[reused_old]
+        if fresh_rows:
+            index.release_days[fresh_rows] = release_days_of(new_df.iloc[fresh_rows])
+
+        index.lists, index.facets = {}, {}
+        for key in FACET_KEYS:
+            fresh_lists = dict(zip(fresh_rows, index._row_lists(key, fresh_rows)))
+            old_lists = self.lists[key]
+            index.lists[key] = [fresh_lists[i] if i in fresh_lists else old_lists[reuse[i]] for i in range(len(new_df))]
+            index.facets[key] = self.facets[key].updated(index.lists[key], reused_new, reused_old, fresh_rows)
+        return index, diff
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def icon_paths(self, key: str = None) -> list:
+        """
+        CSV 가 참조하는 아이콘 경로의 고유 목록 (CSV 에 적힌 그대로, 정렬).
+
+        Args:
+            key (str, optional): `ICON_KEYS` 중 하나. 생략하면 모든 아이콘 컬럼.
+        """
+        paths = set()
+        for icon_key in ((key,) if key else ICON_KEYS):
+            col = self.column_map.get(icon_key)
+            if col in self.df.columns:
+                for cell in self.df[col]:
+                    paths.update(split_list(cell))
+        return sorted(paths)
+
+    def options(self, key: str) -> list:
+        """사이드바 multiselect 에 표시할 고유값 목록."""
+        return self.facets[key].values
+
+
+# 필터 조건 결합 방식
+MATCH_ANY = 'or'   # 선택한 값 중 하나라도 가지면 통과
+MATCH_ALL = 'and'  # 선택한 값을 모두 가져야 통과
+
+# 컬럼별 기본 결합 방식 (속성은 기존처럼 AND, 나머지는 OR). 서로 다른 컬럼 간에는 항상 AND.
+DEFAULT_MATCH_MODES = {'희귀도': MATCH_ANY, '속성명': MATCH_ALL, '무기명': MATCH_ANY, '방어구명': MATCH_ANY}
+
+
+class FilterEngine:
+    """
+    `CharacterIndex` 의 값별 bool 마스크를 조합하는 필터 엔진.
+
+    한 컬럼 안에서는 OR(하나라도) 또는 AND(모두) 로, 서로 다른 컬럼 사이는 AND 로 결합합니다.
+    DataFrame 복사나 행 단위 apply 없이 NumPy 연산만 사용합니다.
+    """
+
+    def __init__(self, index: CharacterIndex, match_modes: dict = None):
+        self.index = index
+        self.match_modes = dict(DEFAULT_MATCH_MODES)
+        if match_modes:
+            self.match_modes.update(match_modes)
+
+    def _facet_mask(self, key: str, selected) -> np.ndarray:
+        facet = self.index.facets[key]
+        if not selected:
+            return np.ones(len(self.index), dtype=bool)
+        cols = [facet.values.index(v) for v in selected if v in facet.values]
+        if self.match_modes.get(key, MATCH_ANY) == MATCH_ALL:
+            if len(cols) < len(set(selected)):
+                # 존재하지 않는 값을 요구하면 아무도 통과하지 못함
+                return np.zeros(len(self.index), dtype=bool)
+            return facet.membership[:, cols].all(axis=1)
+        return facet.membership[:, cols].any(axis=1)
+
+    def _name_mask(self, name_query: str) -> np.ndarray:
+        if not (name_query or '').strip():
+            return np.ones(len(self.index), dtype=bool)
+        return self.index.search.mask(name_query)
+
+    def query(self, selections: dict, name_query: str = '') -> np.ndarray:
+        """
+        필터 조건에 맞는 행의 bool 마스크를 반환합니다.
+
+        Args:
+            selections (dict): {컬럼 키: 선택값 리스트}. 예) {'희귀도': ['5★'], '속성명': ['불', '물']}
+            name_query (str): 이름 검색어 (한글/영문 부분 일치, 초성, 오타 허용 — `NameSearchIndex`).
+
+        Returns:
+            np.ndarray: 길이 len(index) 의 bool 마스크.
+        """
+        mask = self._name_mask(name_query)
+        for key, selected in selections.items():
+            if selected:
+                mask &= self._facet_mask(key, selected)
+        return mask
+
+    def facet_counts(self, selections: dict, name_query: str = '') -> dict:
+        """
+        사이드바 옵션 옆에 표시할 값별 결과 수를 계산합니다.
+
+        OR 컬럼은 해당 컬럼의 선택을 제외한 나머지 조건으로(값을 추가 선택했을 때 늘어날 수),
+        AND 컬럼은 전체 조건으로(값을 추가 선택했을 때 남을 수) 셉니다.
+
+        Returns:
+            dict: {컬럼 키: {값: 개수}}
+        """
+        base = self._name_mask(name_query)
+        masks = {key: self._facet_mask(key, selections.get(key)) for key in self.index.facets}
+        counts = {}
+        for key, facet in self.index.facets.items():
+            mask = base.copy()
+            for other, other_mask in masks.items():
+                if other != key or self.match_modes.get(key, MATCH_ANY) == MATCH_ALL:
+                    mask &= other_mask
+            per_value = facet.membership[mask].sum(axis=0)
+            counts[key] = dict(zip(facet.values, per_value.tolist()))
+        return counts
+
+
+class ResultCache:
+    """
+    데이터 원본(CSV 경로)별 버전을 추적하는 프로세스 공용 LRU 결과 캐시.
+
+    항목 키는 (원본, 키) 이며, 같은 원본에 대해 다른 버전(mtime/크기)으로 조회하면
+    그 원본의 기존 항목을 모두 무효화합니다. 항목 수(`max_entries`)와 문자열 값의 총 길이(`max_bytes`)로 제한됩니다.
+    """
+
+    def __init__(self, max_entries: int = 64, max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # (source, key) -> (value, size)
+        self._versions = {}            # source -> version
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _size_of(value) -> int:
+        if isinstance(value, (str, bytes)):
+            return len(value)
+        if isinstance(value, tuple):
+            return sum(len(v) for v in value if isinstance(v, (str, bytes)))
+        return 0
+
+    def _sync_version(self, source, version):
+        # 락을 잡은 상태에서 호출
+        if self._versions.get(source) != version:
+            for entry_key in [k for k in self._entries if k[0] == source]:
+                self.current_bytes -= self._entries.pop(entry_key)[1]
+            self._versions[source] = version
+
+    def get(self, source, version, key, default=None):
+        """캐시된 값을 반환 (없거나 버전이 바뀌었으면 `default`)."""
+        with self._lock:
+            self._sync_version(source, version)
+            entry = self._entries.get((source, key))
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end((source, key))
+            self.hits += 1
+            return entry[0]
+
+    def put(self, source, version, key, value):
+        """값을 저장하고, 한도를 넘으면 오래된 항목부터 제거."""
+        size = self._size_of(value)
+        with self._lock:
+            self._sync_version(source, version)
+            old = self._entries.pop((source, key), None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            if size > self.max_bytes:
+                return
+            self._entries[(source, key)] = (value, size)
+            self.current_bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self.current_bytes > self.max_bytes):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+
+    def discard(self, source, match) -> int:
+        """`source` 의 항목 중 `match(key)` 가 참인 것만 제거하고 제거한 개수를 반환."""
+        with self._lock:
+            doomed = [k for k in self._entries if k[0] == source and match(k[1])]
+            for entry_key in doomed:
+                self.current_bytes -= self._entries.pop(entry_key)[1]
+        return len(doomed)
+
+    def get_or_compute(self, source, version, key, compute):
+        """캐시에 없으면 `compute()` 결과를 저장 후 반환."""
+        value = self.get(source, version, key, default=self)
+        if value is self:
+            value = compute()
+            self.put(source, version, key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self.current_bytes = self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self.current_bytes, "hits": self.hits, "misses": self.misses}
+
+
+# 필터 결과(행 번호, 옵션별 개수, 그리드 HTML) 공용 캐시 — 모든 세션이 공유
+FILTER_CACHE = ResultCache()
+
+# 캐릭터 카드 한 장 단위 HTML 조각 캐시 (행 내용 해시·당첨 여부별) — 그리드는 조각을 이어 붙여 조립.
+# 키가 행 내용 기준이므로 로스터가 갱신되어도 바뀌지 않은 카드는 그대로 재사용됨
+CARD_FRAGMENT_CACHE = ResultCache(max_entries=8192, max_bytes=128 * 1024 * 1024)
+
+
+# ─────────────────────────────────────────────
+# 로스터 갱신 (CSV 변경 시 바뀐 행만 반영)
+# ─────────────────────────────────────────────
+# RosterStore.load 에서 읽는 도중 CSV 가 바뀌었을 때 다시 읽는 최대 횟수
+LOAD_RETRIES = 3
+
+
+class _RosterEntry:
+    __slots__ = ("version", "alias_version", "index", "diff")
+
+    def __init__(self, version, alias_version, index, diff):
+        self.version = version
+        self.alias_version = alias_version
+        self.index = index
+        self.diff = diff
+
+
+class RosterStore:
+    """
+    CSV 경로(와 컬럼 매핑)별 최신 `CharacterIndex` 를 보관하는 프로세스 공용 저장소.
+
+    CSV 버전(mtime/크기)이 바뀌면 새 표를 이전 인덱스와 캐릭터명 기준으로 비교해 바뀐 행만 다시 계산한
+    새 인덱스로 교체하고(`CharacterIndex.apply_update`), 없어졌거나 바뀐 행의 카드 HTML 조각만 캐시에서 지웁니다.
+    이전 항목이 없거나 별칭 데이터가 바뀌었으면 전체를 새로 만듭니다. 여러 세션(스레드)에서 호출해도 안전합니다.
+    """
+
+    def __init__(self, fragment_cache: ResultCache = CARD_FRAGMENT_CACHE):
+        self.fragment_cache = fragment_cache
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(csv_path, column_map: dict) -> tuple:
+        return (os.path.abspath(str(csv_path)), tuple(sorted(column_map.items())))
+
+    def current(self, csv_path, column_map: dict):
+        """
+        보관 중인 (버전, 인덱스) 항목. 없으면 None.
+
+        Returns:
+            _RosterEntry | None: `version`, `alias_version`, `index`, `diff`(마지막 갱신 차이) 속성.
+        """
+        with self._lock:
+            return self._entries.get(self._key(csv_path, column_map))
+
+    def install(self, csv_path, column_map: dict, version, index: CharacterIndex, alias_version=None):
+        """미리 만든 인덱스(예: 스냅샷에서 로드)를 현재 버전으로 등록합니다."""
+        with self._lock:
+            self._entries[self._key(csv_path, column_map)] = _RosterEntry(version, alias_version, index, RosterDiff())
+
+    def update(self, csv_path, column_map: dict, version, df: pd.DataFrame, aliases: dict = None, alias_version=None) -> tuple:
+        """
+        `version` 의 표 `df` 로 인덱스를 갱신합니다.
+
+        Args:
+            csv_path: CSV 경로 (카드 조각 캐시의 원본 키).
+            column_map (dict): 컬럼 이름 매핑.
+            version: 새 CSV 버전 (`csv_version`).
+            df (pd.DataFrame): 새로 읽은 CSV 표.
+            aliases (dict, optional): 이름 검색용 영문 별칭.
+            alias_version (optional): 별칭 데이터 버전. 이전 항목과 다르면 전체를 다시 만듭니다.
+
+        Returns:
+            tuple: (CharacterIndex, RosterDiff). 전체를 새로 만들었으면 diff 는 비어 있음.
+        """
+        entry = self.current(csv_path, column_map)
+        if entry is not None and entry.version == version and entry.alias_version == alias_version:
+            return entry.index, entry.diff
+        if entry is not None and entry.alias_version == alias_version:
+            index, diff = entry.index.apply_update(df, aliases)
+            if diff.stale_fingerprints:
+                stale = diff.stale_fingerprints
+                self.fragment_cache.discard(csv_path, lambda key: key[0] in stale)
+        else:
+            index, diff = CharacterIndex(df, column_map, aliases=aliases), RosterDiff()
+        with self._lock:
+            self._entries[self._key(csv_path, column_map)] = _RosterEntry(version, alias_version, index, diff)
+        return index, diff
+
+    def load(self, csv_path, column_map: dict = None, aliases: dict = None, alias_version=None) -> tuple:
+        """
+        헤드리스 사용용: CSV 버전을 확인해 바뀌었을 때만 다시 읽고 갱신한 인덱스를 반환합니다.
+
+        Returns:
+            tuple: (CharacterIndex, CSV 버전). 같은 저장소 항목에서 함께 꺼낸 값이므로, 다른 스레드가 그 사이
+                   CSV 를 다시 읽어도 인덱스와 버전이 어긋나지 않습니다 (버전을 결과 캐시 키로 쓸 때 필요).
+
+        Raises:
+            FileNotFoundError: CSV 가 없을 때.
+            ValueError: CSV 를 해석할 수 없거나 읽는 동안 계속 바뀔 때 (pandas 파싱 오류 포함).
+        """
+        column_map = dict(column_map or DEFAULT_COLUMN_MAP)
+        version = csv_version(str(csv_path))
+        if version is None:
+            raise FileNotFoundError(csv_path)
+        entry = self.current(csv_path, column_map)
+        if entry is not None and entry.version == version and entry.alias_version == alias_version:
+            return entry.index, entry.version
+        # 읽는 도중 파일이 다시 쓰이면 일부만 읽힌 표가 이전 버전으로 기록되지 않도록, 읽은 뒤 버전이 그대로일 때만 사용
+        for _ in range(LOAD_RETRIES):
+            df = pd.read_csv(csv_path).fillna('')
+            after = csv_version(str(csv_path))
+            if after == version:
+                break
+            if after is None:
+                raise FileNotFoundError(csv_path)
+            version = after
+        else:
+            raise ValueError(f"CSV 가 읽는 동안 계속 바뀌고 있습니다: {csv_path}")
+        return self.update(csv_path, column_map, version, df, aliases, alias_version)[0], version
+
+
+# 프로세스 전역 로스터 저장소 (모든 Streamlit 세션과 헤드리스 서버가 공유)
+ROSTER_STORE = RosterStore()
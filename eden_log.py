@@ -0,0 +1,103 @@
+"""
+디버그 로그 모듈.
+세션별로 크기가 고정된 링 버퍼(`DebugLog`)와 이벤트 종류별 카운터, 그리고 모든 세션의 이벤트 수를 모으는
+프로세스 공용 카운터(`EVENT_COUNTS`)를 제공합니다.
+
+로그 메시지는 (이벤트 종류, 인자들) 형태로 받아 두었다가 화면에 표시할 때만 문자열로 만들므로,
+디버그 모드가 꺼져 있을 때 호출 측 비용은 프로세스 카운터 증가 한 번뿐입니다.
+단, 예외 객체는 트레이스백과 그 프레임이 참조하는 데이터까지 붙잡고 있으므로 기록 즉시 문자열로 바꿉니다.
+"""
+import os
+import time
+import threading
+from collections import Counter, deque
+
+DEBUG_ENV = "EDEN_DEBUG"
+
+# 세션별 링 버퍼 크기. 환경변수 EDEN_DEBUG_LOG_SIZE 로 조정 가능.
+DEFAULT_LOG_CAPACITY = 200
+
+
+def debug_enabled_by_env() -> bool:
+    """환경변수 EDEN_DEBUG 가 1/true/yes/on 이면 True."""
+    return os.environ.get(DEBUG_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def log_capacity() -> int:
+    try:
+        return max(1, int(os.environ.get("EDEN_DEBUG_LOG_SIZE", DEFAULT_LOG_CAPACITY)))
+    except (TypeError, ValueError):
+        return DEFAULT_LOG_CAPACITY
+
+
+def _detach(arg):
+    """예외는 "타입: 메시지" 문자열로 바꿔 트레이스백 참조를 끊고, 나머지는 그대로 반환."""
+    if isinstance(arg, BaseException):
+        return f"{type(arg).__name__}: {arg}"
+    return arg
+
+
+def format_entry(entry) -> str:
+    """(시각, 이벤트, 인자들) 항목을 "HH:MM:SS [이벤트] 인자1: 인자2" 문자열로 변환."""
+    ts, event, args = entry
+    detail = ": ".join(str(a) for a in args)
+    return f"{time.strftime('%H:%M:%S', time.localtime(ts))} [{event}] {detail}".rstrip()
+
+
+class DebugLog:
+    """
+    세션 하나의 디버그 로그. 최근 `capacity` 개 항목만 보관하고, 밀려난 항목 수와 이벤트별 누적 수를 셉니다.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_LOG_CAPACITY):
+        self.entries = deque(maxlen=capacity)  # (time.time(), 이벤트, 인자 튜플)
+        self.counts = Counter()
+        self.dropped = 0
+
+    def append(self, event: str, *args):
+        if len(self.entries) == self.entries.maxlen:
+            self.dropped += 1
+        self.entries.append((time.time(), event, tuple(_detach(a) for a in args)))
+        self.counts[event] += 1
+
+    def lines(self, last: int = None) -> list:
+        """최근 항목을 문자열 목록으로 (오래된 것부터). `last` 를 주면 마지막 n개만."""
+        entries = list(self.entries)
+        if last is not None:
+            entries = entries[-last:]
+        return [format_entry(e) for e in entries]
+
+    def clear(self):
+        self.entries.clear()
+        self.counts.clear()
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+class EventCounters:
+    """모든 세션의 이벤트 종류별 발생 수를 모으는 프로세스 공용 카운터 (스레드 안전)."""
+
+    def __init__(self):
+        self._counts = Counter()
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def add(self, event: str):
+        with self._lock:
+            self._counts[event] += 1
+
+    def summary(self) -> dict:
+        """{이벤트: 발생 수} (많은 순)."""
+        with self._lock:
+            return dict(self._counts.most_common())
+
+    def clear(self):
+        with self._lock:
+            self._counts.clear()
+            self.started_at = time.time()
+
+
+# 프로세스 전역 이벤트 카운터 (모든 Streamlit 세션이 공유)
+EVENT_COUNTS = EventCounters()
@@ -0,0 +1,137 @@
+"""
+단계별 실행 시간 측정 모듈.
+Streamlit 스크립트의 한 번 실행(rerun) 동안 import, CSV 로드, 정규화, 필터링, 카드 렌더링, HTML 전송 등
+단계별 소요 시간을 모으고, 프로세스 전체의 최근 실행 기록과 비교해 가장 비싼 단계를 보여줍니다.
+
+측정이 꺼져 있으면 `stage()` 는 아무것도 하지 않는 공용 컨텍스트 매니저를 돌려주므로 비용이 거의 없습니다.
+환경변수 EDEN_PROFILE=1 이면 기본으로 켜집니다.
+"""
+import os
+import time
+import threading
+import statistics
+from collections import OrderedDict, deque
+from contextlib import nullcontext
+
+PROFILE_ENV = "EDEN_PROFILE"
+
+# 프로세스 전역 기록에 보관할 최근 실행 수
+DEFAULT_HISTORY_RUNS = 50
+
+_NULL_STAGE = nullcontext()
+
+
+def profiling_enabled_by_env() -> bool:
+    """환경변수 EDEN_PROFILE 이 1/true/yes/on 이면 True."""
+    return os.environ.get(PROFILE_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class _Stage:
+    __slots__ = ("_profiler", "_name", "_start")
+
+    def __init__(self, profiler, name: str):
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._profiler.add(self._name, time.perf_counter() - self._start)
+        return False
+
+
+class StageProfiler:
+    """
+    한 번의 실행 동안 단계별 소요 시간을 누적합니다. 같은 이름의 단계가 여러 번 실행되면 시간과 횟수를 더합니다.
+
+    사용 예:
+        profiler = StageProfiler(enabled=True)
+        with profiler.stage("필터링"):
+            ...
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._stages = OrderedDict()  # name -> [총 초, 횟수]
+
+    def stage(self, name: str):
+        """`with` 블록의 실행 시간을 `name` 단계로 기록하는 컨텍스트 매니저."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def add(self, name: str, seconds: float):
+        """이미 측정한 시간을 단계에 더합니다 (측정이 꺼져 있으면 무시)."""
+        if not self.enabled:
+            return
+        entry = self._stages.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+    def results(self) -> list:
+        """[(단계명, 총 초, 횟수), ...] (처음 기록된 순서)."""
+        return [(name, total, calls) for name, (total, calls) in self._stages.items()]
+
+    def top(self, n: int = 3) -> list:
+        """가장 오래 걸린 단계 n개 (총 시간 내림차순)."""
+        return sorted(self.results(), key=lambda r: r[1], reverse=True)[:n]
+
+    def report_lines(self) -> list:
+        """디버그 로그("Profile" 이벤트)에 남길 요약 문자열 목록."""
+        lines = [f"{name}: {total * 1000:.1f} ms ({calls}회)" for name, total, calls in self.results()]
+        if lines:
+            worst = ", ".join(f"{name} {total * 1000:.1f} ms" for name, total, _ in self.top())
+            lines.append(f"상위 단계: {worst}")
+        return lines
+
+
+class ProfileHistory:
+    """
+    여러 실행(세션)의 단계별 시간을 최근 `max_runs` 회까지 보관하는 프로세스 공용 기록.
+    이번 실행 값을 중앙값·최댓값과 비교해 회귀를 확인하는 데 사용합니다. 여러 스레드에서 호출해도 안전합니다.
+    """
+
+    def __init__(self, max_runs: int = DEFAULT_HISTORY_RUNS):
+        self.max_runs = max_runs
+        self._runs = {}  # name -> deque[초]
+        self._lock = threading.Lock()
+
+    def record(self, profiler: StageProfiler):
+        """한 번의 실행 결과를 기록합니다."""
+        with self._lock:
+            for name, total, _ in profiler.results():
+                self._runs.setdefault(name, deque(maxlen=self.max_runs)).append(total)
+
+    def summary(self, profiler: StageProfiler = None) -> list:
+        """
+        단계별 통계를 비싼 순서로 반환합니다.
+
+        Args:
+            profiler (StageProfiler, optional): 이번 실행 (있으면 "이번(ms)" 값 포함).
+
+        Returns:
+            list[dict]: {"단계", "이번(ms)", "중앙값(ms)", "최대(ms)", "횟수"} 목록 (중앙값 내림차순).
+        """
+        current = {name: total for name, total, _ in profiler.results()} if profiler else {}
+        with self._lock:
+            rows = [
+                {
+                    "단계": name,
+                    "이번(ms)": round(current[name] * 1000, 2) if name in current else None,
+                    "중앙값(ms)": round(statistics.median(samples) * 1000, 2),
+                    "최대(ms)": round(max(samples) * 1000, 2),
+                    "횟수": len(samples),
+                }
+                for name, samples in self._runs.items() if samples
+            ]
+        return sorted(rows, key=lambda r: r["중앙값(ms)"], reverse=True)
+
+    def clear(self):
+        with self._lock:
+            self._runs.clear()
+
+
+# 프로세스 전역 실행 기록 (모든 Streamlit 세션이 공유)
+PROFILE_HISTORY = ProfileHistory()
@@ -0,0 +1,335 @@
+"""
+룰렛 추첨 엔진 모듈.
+`CharacterIndex` 의 행 번호를 대상으로, NumPy 한 번의 호출로 N명의 당첨자를 뽑습니다.
+
+- 복원/비복원 추첨
+- 희귀도별 가중치, 출시일(최신 우대) 가중치
+- 시드를 지정한 `numpy.random.Generator` 로 결과 재현 가능
+
+Streamlit 의 "룰렛 돌리기!" 버튼과 헤드리스 스크립트가 같은 추첨 경로(`RouletteEngine.spin`)를 사용하며,
+`simulate_fairness` 는 같은 경로로 대량 추첨하여 기대 빈도와 실제 빈도를 비교(카이제곱 검정)합니다.
+"""
+import math
+import time
+
+import numpy as np
+import pandas as pd
+
+from eden_data import CharacterIndex
+
+# 가중치 방식
+WEIGHT_UNIFORM = 'uniform'
+WEIGHT_RARITY = 'rarity'
+WEIGHT_RELEASE = 'release'
+
+# 최신 우대 가중치의 기본 반감기 (일): 최신 캐릭터 대비 이 기간만큼 오래되면 가중치 절반
+DEFAULT_RELEASE_HALF_LIFE_DAYS = 365.0
+
+# 슬롯머신 릴에 표시할 최대 후보 수
+DEFAULT_REEL_SIZE = 50
+
+
+def _draw(rng: np.random.Generator, row_ids: np.ndarray, n: int, replace: bool, p):
+    """모든 추첨이 거치는 단일 샘플링 경로."""
+    return rng.choice(row_ids, size=n, replace=replace, p=p)
+
+
+class SpinResult:
+    """
+    한 번의 룰렛 결과.
+
+    Attributes:
+        winner (int): 당첨자 행 번호.
+        reel (np.ndarray): 슬롯머신 릴에 표시할 행 번호들 (당첨자 포함).
+        winner_index (int): `reel` 안에서 당첨자의 위치.
+    """
+
+    def __init__(self, winner: int, reel: np.ndarray, winner_index: int):
+        self.winner = winner
+        self.reel = reel
+        self.winner_index = winner_index
+
+
+class RouletteEngine:
+    """
+    캐릭터 인덱스를 대상으로 하는 벡터화된 추첨기.
+
+    Generator 는 스레드 간 공유하면 안 되므로, 세션/요청마다 엔진을 새로 만들거나
+    같은 시드로 다시 만들어 결과를 재현합니다.
+
+    Args:
+        index (CharacterIndex): 추첨 대상 인덱스.
+        seed (int | np.random.Generator, optional): 시드 또는 Generator. None 이면 OS 엔트로피 사용.
+    """
+
+    def __init__(self, index: CharacterIndex, seed=None):
+        self.index = index
+        self.rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+
+    def weights(self, row_ids, scheme: str = WEIGHT_UNIFORM, rarity_weights: dict = None,
+                half_life_days: float = DEFAULT_RELEASE_HALF_LIFE_DAYS):
+        """
+        후보 행들의 추첨 가중치를 계산합니다.
+
+        Args:
+            row_ids: 후보 행 번호 배열.
+            scheme (str): 'uniform' | 'rarity' | 'release'.
+            rarity_weights (dict, optional): 'rarity' 방식에서 {희귀도: 가중치}. 없는 희귀도는 1.0.
+            half_life_days (float): 'release' 방식에서 최신 출시일 대비 가중치가 절반이 되는 기간(일).
+
+        Returns:
+            np.ndarray | None: 합이 1 인 확률 배열. 균등이면 None.
+        """
+        row_ids = np.asarray(row_ids, dtype=np.int64)
+        if scheme == WEIGHT_UNIFORM or len(row_ids) == 0:
+            return None
+        if scheme == WEIGHT_RARITY:
+            facet = self.index.facets['희귀도']
+            rarity_weights = rarity_weights or {}
+            # 코드 -1 (희귀도 없음) 은 마지막 칸의 1.0 을 사용
+            by_code = np.array([float(rarity_weights.get(v, 1.0)) for v in facet.values] + [1.0])
+            w = by_code[facet.codes[row_ids]]
+        elif scheme == WEIGHT_RELEASE:
+            days = self.index.release_days[row_ids]
+            newest = np.nanmax(days) if np.isfinite(days).any() else 0.0
+            # 출시일이 없는 캐릭터는 가장 오래된 것으로 취급
+            oldest = np.nanmin(days) if np.isfinite(days).any() else 0.0
+            age = newest - np.where(np.isfinite(days), days, oldest)
+            w = np.power(0.5, age / float(half_life_days))
+        else:
+            raise ValueError(f"알 수 없는 가중치 방식: {scheme}")
+        if np.any(w < 0) or not np.isfinite(w).all():
+            raise ValueError("가중치는 0 이상의 유한한 값이어야 합니다.")
+        total = w.sum()
+        if total <= 0:
+            raise ValueError("가중치의 합이 0 입니다.")
+        return w / total
+
+    def draw(self, row_ids, n: int = 1, replace: bool = False, p=None) -> np.ndarray:
+        """
+        후보 중 `n` 명을 한 번의 호출로 뽑습니다.
+
+        Args:
+            row_ids: 후보 행 번호 배열.
+            n (int): 뽑을 인원.
+            replace (bool): 복원 추첨 여부 (False 면 같은 캐릭터가 중복되지 않음).
+            p (np.ndarray, optional): `weights()` 가 반환한 확률 배열. None 이면 균등.
+
+        Returns:
+            np.ndarray: 당첨 행 번호 배열 (길이 n).
+        """
+        row_ids = np.asarray(row_ids, dtype=np.int64)
+        if len(row_ids) == 0:
+            raise ValueError("추첨할 후보가 없습니다.")
+        if not replace and n > len(row_ids):
+            raise ValueError(f"비복원 추첨 인원({n})이 후보 수({len(row_ids)})보다 많습니다.")
+        if not replace and p is not None and n > np.count_nonzero(p):
+            raise ValueError("가중치가 0 보다 큰 후보 수보다 많이 뽑을 수 없습니다.")
+        return _draw(self.rng, row_ids, n, replace, p)
+
+    def winners(self, row_ids, spins: int = 1, p=None) -> np.ndarray:
+        """
+        "룰렛 돌리기!" `spins` 번의 당첨자를 한 번의 호출로 뽑습니다.
+        한 번의 룰렛은 `draw(row_ids, 1, replace=False, p=p)` 이고, 1명 추첨에서는 복원 여부가 결과 분포에
+        영향을 주지 않으므로 서로 독립인 `spins` 번의 룰렛은 `draw(row_ids, spins, replace=True, p=p)` 와 같습니다.
+        `spin` 과 `simulate_fairness` 가 모두 이 메서드를 거칩니다.
+
+        Args:
+            row_ids: 후보 행 번호 배열.
+            spins (int): 룰렛 횟수.
+            p (np.ndarray, optional): 당첨자 추첨 확률 배열.
+
+        Returns:
+            np.ndarray: 룰렛마다의 당첨 행 번호 배열 (길이 spins).
+        """
+        if p is not None and np.count_nonzero(p) == 0:
+            raise ValueError("가중치가 0 보다 큰 후보가 없습니다.")
+        return self.draw(row_ids, spins, replace=True, p=p)
+
+    def spin(self, row_ids, reel_size: int = DEFAULT_REEL_SIZE, p=None) -> SpinResult:
+        """
+        "룰렛 돌리기!" 한 번에 해당하는 추첨: 당첨자 1명과 슬롯머신 릴 후보들을 뽑습니다.
+        릴 후보는 연출용이므로 균등하게 뽑고, 당첨자를 릴의 임의 위치에 넣습니다.
+
+        Args:
+            row_ids: 후보 행 번호 배열.
+            reel_size (int): 릴 후보 최대 수.
+            p (np.ndarray, optional): 당첨자 추첨 확률 배열.
+
+        Returns:
+            SpinResult: 당첨자, 릴, 릴 안의 당첨자 위치.
+        """
+        row_ids = np.asarray(row_ids, dtype=np.int64)
+        winner = int(self.winners(row_ids, 1, p=p)[0])
+        reel = self.draw(row_ids, min(len(row_ids), reel_size))
+        winner_index = int(self.rng.integers(len(reel)))
+        reel[winner_index] = winner
+        return SpinResult(winner, reel, winner_index)
+
+
+# ─────────────────────────────────────────────
+# 몬테카를로 공정성 시뮬레이션
+# ─────────────────────────────────────────────
+
+# 한 번에 추첨하는 최대 횟수 (메모리 사용량 상한: 청크당 int64 배열 1개)
+DEFAULT_SIM_CHUNK = 1_000_000
+
+
+def chi2_sf(x: float, dof: int) -> float:
+    """
+    카이제곱 분포의 생존함수 P(X >= x) (= 정규화된 상부 불완전 감마함수 Q(dof/2, x/2)).
+    SciPy 없이 급수/연분수 전개로 계산합니다.
+    """
+    if dof <= 0 or x < 0:
+        return float('nan')
+    a, z = dof / 2.0, x / 2.0
+    if z == 0:
+        return 1.0
+    log_prefix = a * math.log(z) - z - math.lgamma(a)
+    if z < a + 1:
+        # 하부 감마 급수 P(a, z)
+        term = total = 1.0 / a
+        ap = a
+        for _ in range(10000):
+            ap += 1
+            term *= z / ap
+            total += term
+            if abs(term) < abs(total) * 1e-15:
+                break
+        return max(0.0, 1.0 - total * math.exp(log_prefix))
+    # 상부 감마 연분수 Q(a, z) (Lentz 방법)
+    tiny = 1e-300
+    b = z + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 10000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-15:
+            break
+    return min(1.0, math.exp(log_prefix) * h)
+
+
+def _chi_square(observed: np.ndarray, expected: np.ndarray):
+    """(카이제곱 통계량, 자유도, p-value). 기대 빈도 0 인 칸은 제외."""
+    mask = expected > 0
+    stat = float(((observed[mask] - expected[mask]) ** 2 / expected[mask]).sum())
+    dof = int(mask.sum()) - 1
+    return stat, dof, (chi2_sf(stat, dof) if dof > 0 else float('nan'))
+
+
+def _simulate_chunk(row_ids: np.ndarray, p, n: int, seed_seq) -> np.ndarray:
+    """
+    청크 하나(룰렛 `n` 번)를 `RouletteEngine.winners` 로 추첨하여 후보 위치별 당첨 횟수를 반환 (프로세스 풀 작업 단위).
+    엔진에는 인덱스가 필요 없으므로(가중치 `p` 는 미리 계산됨) 작업마다 인덱스를 넘기지 않습니다.
+    """
+    winners = RouletteEngine(None, np.random.default_rng(seed_seq)).winners(row_ids, n, p=p)
+    # 당첨 행 번호 → 후보 위치
+    position = np.full(int(row_ids.max()) + 1, -1, dtype=np.int64)
+    position[row_ids] = np.arange(len(row_ids))
+    return np.bincount(position[winners], minlength=len(row_ids))
+
+
+class FairnessReport:
+    """
+    `simulate_fairness` 결과.
+
+    Attributes:
+        draws (int): 총 추첨 횟수.
+        per_character (pd.DataFrame): 캐릭터별 기대/실제 빈도 (이름, 희귀도, expected_p, observed_p, expected, observed, z).
+        per_rarity (pd.DataFrame): 희귀도별 기대/실제 빈도.
+        chi2, dof, p_value: 캐릭터 단위 카이제곱 적합도 검정 결과.
+        rarity_chi2, rarity_dof, rarity_p_value: 희귀도 단위 검정 결과.
+        elapsed_s (float): 소요 시간 (초).
+    """
+
+    def __init__(self, draws, per_character, per_rarity, chi2, rarity_chi2, elapsed_s):
+        self.draws = draws
+        self.per_character = per_character
+        self.per_rarity = per_rarity
+        self.chi2, self.dof, self.p_value = chi2
+        self.rarity_chi2, self.rarity_dof, self.rarity_p_value = rarity_chi2
+        self.elapsed_s = elapsed_s
+
+
+def simulate_fairness(index: CharacterIndex, row_ids, draws: int = 1_000_000, p=None, seed=None,
+                      chunk_size: int = DEFAULT_SIM_CHUNK, workers: int = 0) -> FairnessReport:
+    """
+    현재 후보들에 대해 룰렛 당첨 추첨(`RouletteEngine.spin` 과 같은 `RouletteEngine.winners` 경로)을 대량으로 반복하여
+    캐릭터별·희귀도별 기대 빈도와 실제 빈도를 비교합니다.
+
+    추첨은 `chunk_size` 단위로 나누어 메모리 사용량을 일정하게 유지하며, 청크마다 SeedSequence 로
+    독립적인 난수열을 만들어 `workers` 수와 무관하게 같은 시드면 같은 결과가 나옵니다.
+
+    Args:
+        index (CharacterIndex): 캐릭터 인덱스.
+        row_ids: 후보 행 번호 배열 (현재 필터 결과).
+        draws (int): 총 추첨 횟수.
+        p (np.ndarray, optional): 당첨 확률 배열 (`RouletteEngine.weights`). None 이면 균등.
+        seed (int, optional): 시드.
+        chunk_size (int): 청크당 추첨 횟수.
+        workers (int): 0/1 이면 현재 프로세스에서, 2 이상이면 프로세스 풀로 청크를 분산.
+            스레드가 도는 Streamlit 서버 안에서 fork 하면 잠금이 걸린 채 복제될 수 있으므로 풀은 spawn 방식으로 만듭니다.
+
+    Returns:
+        FairnessReport: 시뮬레이션 결과.
+    """
+    row_ids = np.asarray(row_ids, dtype=np.int64)
+    if len(row_ids) == 0:
+        raise ValueError("추첨할 후보가 없습니다.")
+    draws = int(draws)
+    chunk_size = max(1, int(chunk_size))
+    started = time.perf_counter()
+
+    sizes = [chunk_size] * (draws // chunk_size)
+    if draws % chunk_size:
+        sizes.append(draws % chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    counts = np.zeros(len(row_ids), dtype=np.int64)
+    if workers and workers > 1 and len(sizes) > 1:
+        # 프로세스 풀(multiprocessing)은 import 비용이 커서 병렬 시뮬레이션을 할 때만 불러옴
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            for chunk_counts in pool.map(_simulate_chunk, [row_ids] * len(sizes), [p] * len(sizes), sizes, seeds):
+                counts += chunk_counts
+    else:
+        for n, seed_seq in zip(sizes, seeds):
+            counts += _simulate_chunk(row_ids, p, n, seed_seq)
+
+    expected_p = np.full(len(row_ids), 1.0 / len(row_ids)) if p is None else np.asarray(p, dtype=float)
+    expected = expected_p * draws
+    rarity_col = index.column_map['희귀도']
+    per_character = pd.DataFrame({
+        '이름': index.names[row_ids],
+        '희귀도': index.df[rarity_col].to_numpy()[row_ids],
+        'expected_p': expected_p,
+        'observed_p': counts / draws if draws else 0.0,
+        'expected': expected,
+        'observed': counts,
+    })
+    per_character['z'] = np.where(
+        expected > 0, (counts - expected) / np.sqrt(np.maximum(expected * (1 - expected_p), 1e-12)), 0.0
+    )
+    per_rarity = (
+        per_character.groupby('희귀도', sort=True)[['expected_p', 'observed_p', 'expected', 'observed']].sum().reset_index()
+    )
+
+    return FairnessReport(
+        draws,
+        per_character,
+        per_rarity,
+        _chi_square(counts.astype(float), expected),
+        _chi_square(per_rarity['observed'].to_numpy(dtype=float), per_rarity['expected'].to_numpy()),
+        time.perf_counter() - started,
+    )
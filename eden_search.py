@@ -0,0 +1,244 @@
+"""
+캐릭터 이름 검색 인덱스 모듈.
+한글 캐릭터명, `Matching_names.csv` 의 영문 별칭, 한글 초성을 미리 정규화하여
+부분 일치(접두사 포함)·초성·오타 허용(퍼지) 검색을 빠르게 수행합니다.
+"""
+import os
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+# 영문 별칭 매핑 CSV 의 컬럼명
+ALIAS_INPUT_COL = '캐릭터명 (입력)'   # 영문명
+ALIAS_MATCH_COL = '캐릭터명 (매칭)'   # 한글 캐릭터명
+
+# 한글 초성 (유니코드 음절 순서)
+CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+_CHOSEONG_SET = set(CHOSEONG)
+_HANGUL_BASE, _HANGUL_LAST = 0xAC00, 0xD7A3
+
+# 퍼지 검색에서 후보로 인정하는 최소 바이그램 Dice 유사도
+FUZZY_THRESHOLD = 0.5
+
+# 검색 키 구분자 (정규화된 문자열에 나타나지 않는 문자)
+_SEP = '\x00'
+
+
+def normalize_text(text) -> str:
+    """검색용 정규화: NFC, 소문자, 앞뒤 공백 제거. (NFKC 는 초성 자모를 바꿔버리므로 사용하지 않음)"""
+    return unicodedata.normalize('NFC', str(text or '')).strip().lower()
+
+
+def to_choseong(text: str) -> str:
+    """한글 음절을 초성으로 바꾸고 공백은 제거. 예) '레이븐 AS' → 'ㄹㅇㅂas'"""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        if _HANGUL_BASE <= code <= _HANGUL_LAST:
+            out.append(CHOSEONG[(code - _HANGUL_BASE) // 588])
+        elif not ch.isspace():
+            out.append(ch)
+    return ''.join(out)
+
+
+def is_choseong_query(query: str) -> bool:
+    """초성 자모를 포함하고 완성형 한글 음절은 없는 검색어인지 여부. 예) 'ㄹㅇㅂ', 'ㄹㅇㅂ as'"""
+    has_jamo = any(c in _CHOSEONG_SET for c in query)
+    return has_jamo and not any(_HANGUL_BASE <= ord(c) <= _HANGUL_LAST for c in query)
+
+
+def _bigrams(text: str) -> set:
+    text = text.replace(' ', '')
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def load_name_aliases(alias_csv_path: str) -> dict:
+    """
+    `Matching_names.csv` 를 읽어 {한글 캐릭터명: [영문명, ...]} 딕셔너리로 반환합니다.
+    파일이 없거나 읽을 수 없으면 빈 딕셔너리.
+    """
+    if not alias_csv_path or not os.path.exists(alias_csv_path):
+        return {}
+    try:
+        aliases_df = pd.read_csv(alias_csv_path, encoding='utf-8-sig').dropna()
+    except Exception:
+        return {}
+    if ALIAS_INPUT_COL not in aliases_df.columns or ALIAS_MATCH_COL not in aliases_df.columns:
+        return {}
+    aliases = {}
+    for english, korean in zip(aliases_df[ALIAS_INPUT_COL], aliases_df[ALIAS_MATCH_COL]):
+        english, korean = str(english).strip(), str(korean).strip()
+        if english and korean:
+            aliases.setdefault(korean, []).append(english)
+    return aliases
+
+
+class NameSearchIndex:
+    """
+    캐릭터별 검색 키(한글명, 영문 별칭, 초성)를 미리 만들어 두는 검색 인덱스.
+
+    - 부분 일치: 정규화된 키들 중 하나에 검색어가 포함되면 일치 (접두사 검색 포함, 공백 무시 버전도 비교)
+    - 초성 검색: 검색어가 초성으로만 이루어져 있으면 초성 키와 비교
+    - 퍼지 검색: 부분 일치 결과가 없을 때 바이그램 Dice 유사도가 `FUZZY_THRESHOLD` 이상인 캐릭터
+
+    바이그램 역색인으로 후보 행을 먼저 좁힌 뒤 실제 문자열을 확인합니다.
+    """
+
+    def __init__(self, names, aliases: dict = None):
+        aliases = aliases or {}
+        self.size = len(names)
+        self._keys = []      # 행별 검색 키 리스트
+        self._key_grams = [] # 행별 (키별 바이그램 set) 리스트 (퍼지 검색용, None 이면 처음 쓸 때 계산)
+        self._haystack = []  # 행별 키를 구분자로 이은 문자열 (부분 일치 확인용)
+        self._choseong = []  # 행별 초성 키들
+        self._postings = {}  # 바이그램 -> 행 번호 set
+
+        for name in names:
+            self._append_row(self._row_entry(name, aliases))
+
+    @staticmethod
+    def _row_entry(name, aliases: dict) -> tuple:
+        """캐릭터 한 명의 (검색 키, 키별 바이그램, 이은 문자열, 초성 키)."""
+        korean = normalize_text(name)
+        keys = {korean, korean.replace(' ', '')}
+        for alias in aliases.get(str(name).strip(), []):
+            alias = normalize_text(alias)
+            keys.update((alias, alias.replace(' ', '')))
+        keys.discard('')
+        keys = sorted(keys)
+        return keys, [_bigrams(k) for k in keys], _SEP.join(keys), to_choseong(korean)
+
+    def _append_row(self, entry: tuple):
+        keys, key_grams, haystack, choseong = entry
+        row_id = len(self._keys)
+        self._keys.append(keys)
+        self._key_grams.append(key_grams)
+        self._haystack.append(haystack)
+        self._choseong.append(choseong)
+        for grams in key_grams:
+            for gram in grams:
+                self._postings.setdefault(gram, set()).add(row_id)
+
+    @classmethod
+    def from_arrays(cls, haystack: list, choseong: list, grams: list, offsets: list, rows: list) -> 'NameSearchIndex':
+        """
+        `to_arrays()` 로 저장해 둔 값으로 인덱스를 복원합니다 (정규화·바이그램 계산 생략, `eden_snapshot` 로드용).
+        퍼지 검색용 키별 바이그램은 해당 행이 처음 후보가 될 때 계산합니다.
+        """
+        index = cls([])
+        index.size = len(haystack)
+        index._haystack = list(haystack)
+        index._keys = [h.split(_SEP) if h else [] for h in index._haystack]
+        index._key_grams = [None] * index.size
+        index._choseong = list(choseong)
+        index._postings = {gram: set(rows[offsets[i]:offsets[i + 1]]) for i, gram in enumerate(grams)}
+        return index
+
+    def to_arrays(self) -> tuple:
+        """
+        저장용 값: (행별 이은 키 문자열, 행별 초성 키, 바이그램 목록, 바이그램별 행 번호 구간 시작 위치, 행 번호).
+        바이그램 i 의 행 번호는 rows[offsets[i]:offsets[i + 1]].
+        """
+        grams = sorted(self._postings)
+        offsets, rows = [0], []
+        for gram in grams:
+            rows.extend(sorted(self._postings[gram]))
+            offsets.append(len(rows))
+        return list(self._haystack), list(self._choseong), grams, offsets, rows
+
+    def _row_key_grams(self, row_id: int) -> list:
+        grams = self._key_grams[row_id]
+        if grams is None:
+            grams = self._key_grams[row_id] = [_bigrams(k) for k in self._keys[row_id]]
+        return grams
+
+    def updated(self, names, reuse: dict, aliases: dict = None) -> 'NameSearchIndex':
+        """
+        행 순서·내용이 바뀐 로스터용 새 인덱스를 만듭니다. `reuse` 에 있는 행은 기존 검색 키를 그대로 쓰고
+        나머지 행만 정규화·바이그램 계산을 다시 합니다 (기존 인덱스는 변경하지 않음).
+
+        Args:
+            names: 새 로스터의 캐릭터명 (행 순서대로).
+            reuse (dict): {새 행 번호: 기존 행 번호} — 이름과 내용이 그대로인 행.
+            aliases (dict, optional): 영문 별칭 (기존 인덱스와 같은 것을 사용해야 함).
+        """
+        aliases = aliases or {}
+        index = NameSearchIndex([], aliases)
+        index.size = len(names)
+        for row_id, name in enumerate(names):
+            old = reuse.get(row_id)
+            if old is None:
+                index._append_row(self._row_entry(name, aliases))
+            else:
+                index._append_row((self._keys[old], self._row_key_grams(old), self._haystack[old], self._choseong[old]))
+        return index
+
+    def _candidates(self, query: str):
+        """검색어의 모든 바이그램을 포함하는 행 (부분 일치의 필요조건). 한 글자 검색어는 None(전체)."""
+        grams = _bigrams(query)
+        if len(query.replace(' ', '')) < 2:
+            return None
+        rows = None
+        for gram in sorted(grams, key=lambda g: len(self._postings.get(g, ()))):
+            posting = self._postings.get(gram)
+            if not posting:
+                return set()
+            rows = set(posting) if rows is None else rows & posting
+            if not rows:
+                return rows
+        return rows
+
+    def search(self, query: str, fuzzy: bool = True) -> list:
+        """
+        검색어와 일치하는 행 번호 목록(오름차순)을 반환합니다.
+
+        Args:
+            query (str): 한글/영문 이름 일부 또는 초성.
+            fuzzy (bool): 부분 일치 결과가 없을 때 퍼지 검색으로 대체할지 여부.
+
+        Returns:
+            list[int]: 일치하는 행 번호.
+        """
+        query = normalize_text(query)
+        if not query:
+            return list(range(self.size))
+
+        if is_choseong_query(query):
+            compact = query.replace(' ', '')
+            return [i for i, key in enumerate(self._choseong) if compact in key]
+
+        compact = query.replace(' ', '')
+        candidates = self._candidates(compact)
+        rows = range(self.size) if candidates is None else sorted(candidates)
+        matches = [i for i in rows if query in self._haystack[i] or compact in self._haystack[i]]
+        if matches or not fuzzy or len(compact) < 2:
+            return matches
+        return self.fuzzy_search(compact)
+
+    def fuzzy_search(self, query: str, threshold: float = FUZZY_THRESHOLD) -> list:
+        """바이그램 Dice 유사도가 `threshold` 이상인 행 번호 목록 (유사도 내림차순)."""
+        query_grams = _bigrams(normalize_text(query))
+        if not query_grams:
+            return []
+        # 바이그램을 하나라도 공유하는 행만 점수 계산
+        shared = set()
+        for gram in query_grams:
+            shared |= self._postings.get(gram, set())
+        scored = []
+        for row_id in shared:
+            best = max(
+                2 * len(query_grams & key_grams) / (len(query_grams) + len(key_grams))
+                for key_grams in self._row_key_grams(row_id)
+            )
+            if best >= threshold:
+                scored.append((-best, row_id))
+        return [row_id for _, row_id in sorted(scored)]
+
+    def mask(self, query: str, fuzzy: bool = True) -> np.ndarray:
+        """`search` 결과를 길이 `size` 의 bool 마스크로 반환."""
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.search(query, fuzzy)] = True
+        return mask
@@ -0,0 +1,427 @@
+"""
+헤드리스 룰렛 HTTP/JSON 서비스.
+Streamlit 화면(카드 그리드) 없이 룰렛만 필요한 디스코드 봇·방송 오버레이용으로, Streamlit 앱과 같은
+로스터 저장소(`ROSTER_STORE`), 필터 엔진(`FilterEngine`), 추첨 경로(`RouletteEngine.spin`)를 사용해
+당첨자와 슬롯머신 릴 후보를 JSON 으로 돌려줍니다. 아이콘은 data URI 대신 URL 로 응답합니다.
+
+프로세스당 인덱스 하나를 모든 요청이 공유하며(CSV 가 바뀌면 바뀐 행만 갱신), 요청은 스레드별로 처리됩니다.
+표준 라이브러리 `http.server` 만 사용하므로 추가 의존성이나 외부 서비스 없이 로컬에서 바로 실행할 수 있습니다.
+
+사용법:
+    python eden_service.py                         # http://127.0.0.1:8766/ 에서 서비스
+    python eden_service.py --port 0                # 임의의 빈 포트
+    python eden_service.py --once "rarity=5★&q=레이븐"   # 서버 없이 한 번 추첨해 JSON 출력
+
+엔드포인트:
+    GET  /health                 상태, 캐릭터 수
+    GET  /options                필터 선택지 (희귀도/속성/무기/방어구)
+    GET  /spin?rarity=5★&attr=불&attr_mode=AND&weapon=검&q=레이븐&weights=rarity&reel=30&seed=1
+    POST /spin                   위와 같은 키의 JSON 본문 (값은 문자열 또는 리스트, 최대 64 KiB)
+    GET  /icons/<CSV 아이콘 경로>  원본 아이콘 파일
+    GET  /static/<파일명>          build_assets.py 로 만든 썸네일 (내용 해시 파일명, 장기 캐시. manifest.json 은 no-cache)
+"""
+import os
+import sys
+import json
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, quote, unquote
+
+import numpy as np
+
+from eden_data import FilterEngine, DEFAULT_COLUMN_MAP, FILTER_CACHE, ROSTER_STORE, MATCH_ALL, MATCH_ANY, RELEASE_COL, csv_version
+from eden_search import load_name_aliases
+from eden_roulette import RouletteEngine, DEFAULT_REEL_SIZE, DEFAULT_RELEASE_HALF_LIFE_DAYS, WEIGHT_UNIFORM
+from eden_assets import (
+    BASE_DIR, ASSET_MANIFEST, ASSET_RESOLVER, ASSET_OUT_DIR, ICON_ROOT_DIR, IMMUTABLE_CACHE_CONTROL,
+    MANIFEST_NAME, CARD_ICON_SIZE, SLOT_ICON_SIZE, mime_for,
+)
+
+DEFAULT_CSV_PATH = BASE_DIR / "eden_roulette_data.csv"
+DEFAULT_ALIAS_CSV_PATH = BASE_DIR / "Matching_names.csv"
+DEFAULT_PORT = 8766
+
+# 한 번에 요청할 수 있는 최대 릴 후보 수
+MAX_REEL_SIZE = 500
+
+# 원본 아이콘은 같은 경로로 교체될 수 있으므로 짧게 캐시
+ICON_CACHE_CONTROL = "public, max-age=3600"
+
+# POST 본문 최대 크기 (바이트). 필터 조건만 담기므로 작게 제한
+MAX_BODY_BYTES = 64 * 1024
+
+
+class ServiceError(Exception):
+    """HTTP 상태 코드와 함께 JSON 오류로 응답할 요청 오류."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _param_list(params: dict, key: str) -> list:
+    """요청 값(문자열 또는 리스트)을 빈 값을 뺀 문자열 리스트로."""
+    value = params.get(key)
+    if value is None:
+        return []
+    if not isinstance(value, (list, tuple)):
+        value = [value]
+    return [str(v).strip() for v in value if str(v).strip()]
+
+
+def _param(params: dict, key: str, default=None):
+    values = _param_list(params, key)
+    return values[-1] if values else default
+
+
+def _param_int(params: dict, key: str, default=None):
+    value = _param(params, key)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ServiceError(400, f"'{key}' 는 정수여야 합니다: {value}")
+
+
+class RouletteService:
+    """
+    요청 처리 로직 (HTTP 와 무관하게 직접 호출 가능). 여러 스레드에서 동시에 호출해도 안전합니다.
+
+    Args:
+        csv_path: 캐릭터 CSV 경로.
+        column_map (dict, optional): 컬럼 이름 매핑. 기본 `DEFAULT_COLUMN_MAP`.
+        alias_csv_path: 이름 검색용 영문 별칭 CSV.
+        asset_base_url (str, optional): 썸네일(`static/eden`)이 서빙되는 외부 URL (CDN 등).
+                                        없으면 이 서비스의 /static/ 경로를 사용합니다.
+    """
+
+    def __init__(self, csv_path=DEFAULT_CSV_PATH, column_map: dict = None, alias_csv_path=DEFAULT_ALIAS_CSV_PATH,
+                 asset_base_url: str = None):
+        self.csv_path = str(csv_path)
+        self.column_map = dict(column_map or DEFAULT_COLUMN_MAP)
+        self.alias_csv_path = str(alias_csv_path)
+        if asset_base_url and not asset_base_url.endswith("/"):
+            asset_base_url += "/"
+        self.asset_base_url = asset_base_url
+        self._aliases = (None, {})  # (버전, 별칭)
+        self._lock = threading.Lock()
+
+    def index(self):
+        """
+        현재 CSV 버전의 공유 인덱스. CSV 가 바뀌었으면 `ROSTER_STORE` 가 바뀐 행만 갱신합니다.
+
+        Returns:
+            tuple: (CharacterIndex, 결과 캐시 버전). 이름 검색 결과는 별칭에도 좌우되므로
+                   버전은 (CSV 버전, 별칭 버전).
+        """
+        alias_version = csv_version(self.alias_csv_path)
+        with self._lock:
+            if self._aliases[0] != alias_version:
+                self._aliases = (alias_version, load_name_aliases(self.alias_csv_path))
+            aliases = self._aliases[1]
+        try:
+            index, version = ROSTER_STORE.load(self.csv_path, self.column_map, aliases, alias_version)
+        except FileNotFoundError:
+            raise ServiceError(503, f"CSV 파일을 찾을 수 없습니다: {self.csv_path}")
+        except ValueError as e:  # 파싱 오류, 쓰는 중인 파일
+            raise ServiceError(503, f"CSV 파일을 읽을 수 없습니다: {e}")
+        return index, (version, alias_version)
+
+    # ── 아이콘 URL ──
+    def asset_url(self, path: str, size: int, base_url: str):
+        """
+        아이콘의 URL. 빌드된 썸네일이 있으면 썸네일 URL, 없으면 이 서비스의 원본 아이콘 URL.
+
+        Args:
+            path (str): CSV 에 적힌 아이콘 경로.
+            size (int): 표시 크기 (px).
+            base_url (str): 이 서비스의 기준 URL (예: "http://127.0.0.1:8766/").
+
+        Returns:
+            str | None: URL. 파일이 없으면 None.
+        """
+        resolved = ASSET_RESOLVER.resolve(path)
+        if resolved is None:
+            return None
+        if resolved.startswith(("http://", "https://", "data:image")):
+            return resolved
+        variant = ASSET_MANIFEST.variant_for(resolved, size)
+        if variant:
+            return (self.asset_base_url or base_url + "static/") + quote(os.path.basename(variant))
+        rel = os.path.relpath(resolved, BASE_DIR).replace(os.sep, "/")
+        return base_url + "icons/" + quote(rel)
+
+    def icon_file(self, rel_path: str):
+        """/icons/ 요청 경로를 아이콘 디렉토리 안의 실제 파일로 (밖이거나 없으면 None)."""
+        # 클라이언트가 보낸 임의의 경로이므로 결과를 기억하지 않는 조회 사용
+        resolved = ASSET_RESOLVER.lookup(rel_path)
+        if not resolved:
+            return None
+        real = os.path.realpath(resolved)
+        if not real.startswith(os.path.realpath(ICON_ROOT_DIR) + os.sep) or not os.path.isfile(real):
+            return None
+        return real
+
+    @staticmethod
+    def static_file(name: str):
+        """/static/ 요청 파일명을 빌드 산출물 파일로 (하위 경로·없는 파일은 None)."""
+        if not name or "/" in name or "\\" in name or name.startswith("."):
+            return None
+        path = os.path.join(ASSET_OUT_DIR, name)
+        return path if os.path.isfile(path) else None
+
+    # ── 요청 처리 ──
+    def health(self) -> dict:
+        index, version = self.index()
+        return {"ok": True, "characters": len(index), "csv_version": list(version[0])}
+
+    def options(self) -> dict:
+        index, _ = self.index()
+        return {
+            "rarity": index.options('희귀도'),
+            "attr": index.options('속성명'),
+            "weapon": index.options('무기명'),
+            "armor": index.options('방어구명'),
+        }
+
+    def _character(self, index, row_id: int, size: int, base_url: str) -> dict:
+        row = index.df.iloc[row_id]
+        cmap = self.column_map
+        return {
+            "row": row_id,
+            "name": row[cmap['이름']],
+            "rarity": row[cmap['희귀도']],
+            "attributes": index.lists['속성명'][row_id],
+            "weapons": index.lists['무기명'][row_id],
+            "armors": index.lists['방어구명'][row_id],
+            "release_date": str(row[RELEASE_COL]) if RELEASE_COL in index.df.columns else None,
+            "icon_url": self.asset_url(row[cmap['캐릭터아이콘경로']], size, base_url),
+        }
+
+    def spin(self, params: dict, base_url: str) -> dict:
+        """
+        필터 조건에 맞는 후보 중 당첨자 1명과 릴 후보를 뽑습니다 (Streamlit "룰렛 돌리기!" 와 같은 경로).
+
+        Args:
+            params (dict): rarity/attr/weapon (여러 값), attr_mode (AND|OR), q (이름 검색),
+                           weights (uniform|rarity|release), half_life (일), reel (릴 크기), seed (재현용 시드).
+            base_url (str): 아이콘 URL 을 만들 이 서비스의 기준 URL.
+
+        Returns:
+            dict: {"winner", "winner_index", "reel", "candidates", "seed"}.
+
+        Raises:
+            ServiceError: 잘못된 값(400)이거나 조건에 맞는 캐릭터가 없을 때(404).
+        """
+        index, version = self.index()
+        selections = {'희귀도': _param_list(params, 'rarity'), '속성명': _param_list(params, 'attr'),
+                      '무기명': _param_list(params, 'weapon')}
+        attr_mode = (_param(params, 'attr_mode', 'AND')).upper()
+        if attr_mode not in ('AND', 'OR'):
+            raise ServiceError(400, f"attr_mode 는 AND 또는 OR 이어야 합니다: {attr_mode}")
+        name_query = _param(params, 'q', '')
+        reel_size = _param_int(params, 'reel', DEFAULT_REEL_SIZE)
+        if not 1 <= reel_size <= MAX_REEL_SIZE:
+            raise ServiceError(400, f"reel 은 1~{MAX_REEL_SIZE} 사이여야 합니다: {reel_size}")
+        seed = _param_int(params, 'seed')
+
+        engine = FilterEngine(index, {'속성명': MATCH_ALL if attr_mode == 'AND' else MATCH_ANY})
+        filter_key = tuple(tuple(sorted(v)) for v in selections.values()) + (attr_mode, name_query.lower())
+        row_ids = FILTER_CACHE.get_or_compute(
+            self.csv_path, version, ('rows', filter_key),
+            lambda: engine.query(selections, name_query).nonzero()[0],
+        )
+        if len(row_ids) == 0:
+            raise ServiceError(404, "조건에 맞는 캐릭터가 없습니다.")
+
+        try:
+            roulette = RouletteEngine(index, seed)  # Generator 는 요청마다 새로 (스레드 간 공유 금지)
+            half_life = float(_param(params, 'half_life', DEFAULT_RELEASE_HALF_LIFE_DAYS))
+            p = roulette.weights(row_ids, _param(params, 'weights', WEIGHT_UNIFORM), half_life_days=half_life)
+            result = roulette.spin(row_ids, reel_size, p=p)
+        except ValueError as e:
+            raise ServiceError(400, str(e))
+
+        names = index.df[self.column_map['이름']].to_numpy()
+        icons = index.df[self.column_map['캐릭터아이콘경로']].to_numpy()
+        return {
+            "winner": dict(self._character(index, result.winner, SLOT_ICON_SIZE, base_url),
+                           card_icon_url=self.asset_url(icons[result.winner], CARD_ICON_SIZE, base_url)),
+            "winner_index": result.winner_index,
+            "reel": [
+                {"row": int(row_id), "name": names[row_id], "icon_url": self.asset_url(icons[row_id], CARD_ICON_SIZE, base_url)}
+                for row_id in result.reel
+            ],
+            "candidates": int(len(row_ids)),
+            "seed": seed,
+        }
+
+
+class _ServiceHandler(BaseHTTPRequestHandler):
+    """`RouletteService` 를 HTTP 로 노출하는 핸들러 (서비스 객체는 `server.service`)."""
+
+    server_version = "EdenRoulette/1.0"
+
+    def _base_url(self) -> str:
+        public_url = self.server.public_url
+        if public_url:
+            return public_url
+        host = self.headers.get("Host") or "%s:%s" % self.server.server_address[:2]
+        return f"http://{host}/"
+
+    def _send_json(self, status: int, payload):
+        body = json.dumps(payload, ensure_ascii=False, default=lambda o: o.item() if isinstance(o, np.generic) else str(o)).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_file(self, path: str, cache_control: str):
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            self._send_json(404, {"error": "파일을 찾을 수 없습니다."})
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", mime_for(path))
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", cache_control)
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _dispatch(self, params: dict):
+        service = self.server.service
+        path = urlsplit(self.path).path
+        try:
+            if path.startswith("/icons/"):
+                file_path = service.icon_file(unquote(path[len("/icons/"):]))
+                if file_path is None:
+                    raise ServiceError(404, "아이콘을 찾을 수 없습니다.")
+                self._send_file(file_path, ICON_CACHE_CONTROL)
+            elif path.startswith("/static/"):
+                file_path = service.static_file(unquote(path[len("/static/"):]))
+                if file_path is None:
+                    raise ServiceError(404, "파일을 찾을 수 없습니다.")
+                # manifest 는 이름이 고정이고 빌드마다 내용이 바뀌므로 매번 재검증 (_StaticAssetHandler 와 동일)
+                name = os.path.basename(file_path)
+                self._send_file(file_path, "no-cache" if name == MANIFEST_NAME else IMMUTABLE_CACHE_CONTROL)
+            elif path == "/spin":
+                self._send_json(200, service.spin(params, self._base_url()))
+            elif path == "/options":
+                self._send_json(200, service.options())
+            elif path in ("/", "/health"):
+                self._send_json(200, service.health())
+            else:
+                raise ServiceError(404, f"알 수 없는 경로: {path}")
+        except ServiceError as e:
+            self._send_json(e.status, {"error": str(e)})
+        except Exception as e:  # 요청 하나의 실패가 서버를 멈추지 않도록
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+
+    def do_GET(self):
+        self._dispatch(parse_qs(urlsplit(self.path).query))
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_BODY_BYTES:
+            # 본문을 읽지 않으므로 연결을 재사용하지 않음
+            self.close_connection = True
+            if length < 0:
+                self._send_json(400, {"error": "Content-Length 헤더가 올바르지 않습니다."})
+            else:
+                self._send_json(413, {"error": f"요청 본문이 너무 큽니다 (최대 {MAX_BODY_BYTES}바이트)."})
+            return
+        try:
+            params = json.loads(self.rfile.read(length) or b"{}") if length else {}
+        except ValueError:
+            self._send_json(400, {"error": "JSON 본문을 해석할 수 없습니다."})
+            return
+        if not isinstance(params, dict):
+            self._send_json(400, {"error": "JSON 본문은 객체여야 합니다."})
+            return
+        self._dispatch(params)
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+def make_server(service: RouletteService, host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                public_url: str = None, quiet: bool = False) -> ThreadingHTTPServer:
+    """
+    서비스를 요청별 스레드로 처리하는 HTTP 서버를 만듭니다 (`serve_forever()` 로 시작).
+
+    Args:
+        service (RouletteService): 모든 요청이 공유할 서비스.
+        host (str): 바인딩 주소.
+        port (int): 포트. 0 이면 임의의 빈 포트 (`server.server_address` 로 확인).
+        public_url (str, optional): 응답의 아이콘 URL 기준 주소. 없으면 요청의 Host 헤더 사용.
+        quiet (bool): 요청 로그 출력 생략.
+    """
+    server = ThreadingHTTPServer((host, port), _ServiceHandler)
+    server.daemon_threads = True
+    server.service = service
+    server.public_url = public_url if not public_url or public_url.endswith("/") else public_url + "/"
+    server.quiet = quiet
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Another Eden 룰렛 헤드리스 HTTP/JSON 서비스")
+    parser.add_argument("--csv", default=str(DEFAULT_CSV_PATH), help="캐릭터 CSV 경로")
+    parser.add_argument("--host", default="127.0.0.1", help="바인딩 주소")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="포트 (0 이면 임의의 빈 포트)")
+    parser.add_argument("--public-url", help="응답 아이콘 URL 의 기준 주소 (프록시 뒤에서 실행할 때)")
+    parser.add_argument("--asset-base-url", default=os.environ.get("EDEN_ASSET_BASE_URL"),
+                        help="썸네일이 서빙되는 외부 URL (기본: 이 서비스의 /static/)")
+    parser.add_argument("--quiet", action="store_true", help="요청 로그 출력 생략")
+    parser.add_argument("--once", metavar="QUERY", nargs="?", const="",
+                        help='서버 없이 한 번 추첨해 JSON 출력 (예: "rarity=5★&q=레이븐")')
+    args = parser.parse_args(argv)
+
+    service = RouletteService(args.csv, asset_base_url=args.asset_base_url)
+    if args.once is not None:
+        try:
+            result = service.spin(parse_qs(args.once), args.public_url or f"http://{args.host}:{args.port}/")
+        except ServiceError as e:
+            print(f"[Error] {e}", file=sys.stderr)
+            return 1
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return 0
+
+    try:
+        service.health()  # 첫 요청 전에 인덱스를 만들어 둠
+    except ServiceError as e:
+        print(f"[Error] {e}", file=sys.stderr)
+        return 1
+    server = make_server(service, args.host, args.port, args.public_url, args.quiet)
+    host, port = server.server_address[:2]
+    print(f"룰렛 서비스 시작: http://{host}:{port}/ (Ctrl+C 로 종료)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,328 @@
+"""
+로스터 스냅샷 모듈.
+CSV 를 정규화한 결과(`CharacterIndex` 의 표, Facet 행렬, 출시일 배열)와 CSV 가 참조하는 아이콘의
+Base64 인코딩 결과를 하나의 버전 디렉토리에 저장해 두고, 앱 시작 시 그대로 읽어
+CSV 파싱·정규화·리스트 분리·이름 검색 키·행 해시 계산과 첫 아이콘 인코딩을 건너뜁니다.
+
+스냅샷에는 원본 CSV 의 내용 해시(SHA-1)가 기록되어 있어, CSV 가 바뀌었거나 스냅샷이 없으면
+`load_snapshot` 이 None 을 반환하고 호출 측은 기존대로 CSV 에서 인덱스를 만듭니다.
+별칭(Matching_names.csv)만 바뀌었으면 이름 검색 인덱스만 다시 만듭니다.
+(pyarrow 는 의존성에 없으므로 숫자 배열은 NumPy `.npy`, 문자열은 JSON 으로 저장합니다.)
+
+사용법:
+    python eden_snapshot.py                          # eden_roulette_data.csv 로 스냅샷 생성
+    python eden_snapshot.py --csv other.csv          # 다른 CSV
+    python eden_snapshot.py --no-icons               # 아이콘 사전 인코딩 생략
+
+디렉토리 구조 (`SNAPSHOT_DIR`):
+    current.json                  # 현재 스냅샷 디렉토리 이름 (원자적으로 교체)
+    roster-v1-<csv sha1 앞 10자>/
+        meta.json                 # 포맷 버전, CSV·별칭 해시, 컬럼 매핑, Facet 값 목록, 아이콘 목차
+        rows.json                 # 정규화된 컬럼 값, 이름 검색 키(이은 키·초성·바이그램 목록)
+        facet_<n>_membership.npy  # Facet 행×값 bool 행렬
+        facet_<n>_codes.npy       # Facet 행별 첫 값 코드
+        facet_<n>_list_codes.npy  # 행별 값 리스트 (값 코드를 이어 붙인 배열)
+        facet_<n>_list_offsets.npy  #   └ 행별 시작 위치
+        search_offsets.npy        # 이름 검색 바이그램별 행 번호 구간 시작 위치
+        search_rows.npy           #   └ 행 번호
+        fingerprints.npy          # 행 내용 해시 (uint64)
+        release_days.npy          # 출시일 (1970-01-01 기준 일수)
+        icons.bin                 # 아이콘 Base64 문자열을 이어 붙인 ASCII 블록
+"""
+import os
+import sys
+import json
+import mmap
+import base64
+import hashlib
+import shutil
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from eden_data import CharacterIndex, Facet, FACET_KEYS, DEFAULT_COLUMN_MAP
+from eden_assets import (
+    BASE_DIR, ASSET_MANIFEST, ASSET_RESOLVER, BADGE_ICON_SIZE, CARD_ICON_SIZE, SLOT_ICON_SIZE, file_sha1,
+)
+from eden_search import NameSearchIndex, load_name_aliases
+
+# 스냅샷 형식 버전. 정규화 규칙이나 파일 구성이 바뀌면 올려서 이전 스냅샷을 무효화합니다.
+SNAPSHOT_FORMAT = 2
+
+SNAPSHOT_DIR = BASE_DIR / ".eden_snapshot"
+CURRENT_NAME = "current.json"
+META_NAME = "meta.json"
+ROWS_NAME = "rows.json"
+ICONS_NAME = "icons.bin"
+
+DEFAULT_CSV_PATH = BASE_DIR / "eden_roulette_data.csv"
+DEFAULT_ALIAS_CSV_PATH = BASE_DIR / "Matching_names.csv"
+
+# 아이콘 컬럼(COLUMN_MAP 의 키)별로 미리 인코딩할 표시 크기 (px)
+ICON_COLUMN_SIZES = {
+    '캐릭터아이콘경로': (CARD_ICON_SIZE, SLOT_ICON_SIZE),
+    '속성아이콘': (BADGE_ICON_SIZE,),
+    '무기아이콘': (BADGE_ICON_SIZE,),
+    '방어구아이콘': (BADGE_ICON_SIZE,),
+}
+
+
+def _cache_key(path: str) -> str:
+    """`eden_assets.IconCache` 와 같은 키 (정규화된 절대경로)."""
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _rel_path(path: str) -> str:
+    return os.path.relpath(os.path.abspath(path), BASE_DIR).replace("\\", "/")
+
+
+def _aliases_digest(aliases: dict) -> str:
+    """이름 검색 키를 만든 별칭 데이터의 해시 (별칭이 바뀌었는지 확인용)."""
+    return hashlib.sha1(json.dumps(aliases or {}, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+# ─────────────────────────────────────────────
+# 스냅샷 생성
+# ─────────────────────────────────────────────
+def _icon_files(index: CharacterIndex) -> list:
+    """CSV 가 참조하는 아이콘마다, 표시 크기별로 실제 인코딩될 파일(썸네일 변형 또는 원본) 목록."""
+    files = {}
+    for key, sizes in ICON_COLUMN_SIZES.items():
+        for raw in index.icon_paths(key):
+            path = ASSET_RESOLVER.resolve(raw)
+            if path is None or path.startswith(("http://", "https://", "data:")):
+                continue
+            for size in sizes:
+                target = ASSET_MANIFEST.variant_for(path, size) or path
+                files[_cache_key(target)] = target
+    return sorted(files.values())
+
+
+def build_snapshot(csv_path=DEFAULT_CSV_PATH, column_map: dict = None, out_dir=SNAPSHOT_DIR,
+                   include_icons: bool = True, aliases: dict = None) -> dict:
+    """
+    CSV 로부터 인덱스를 만들어 스냅샷을 기록하고, `current.json` 을 원자적으로 새 스냅샷으로 바꿉니다.
+    이전 스냅샷 디렉토리는 삭제합니다.
+
+    Args:
+        csv_path: 원본 CSV 경로.
+        column_map (dict, optional): 컬럼 이름 매핑 (기본 `DEFAULT_COLUMN_MAP`).
+        out_dir: 스냅샷 루트 디렉토리.
+        include_icons (bool): 아이콘 Base64 를 미리 인코딩해 넣을지 여부.
+        aliases (dict, optional): 이름 검색 키를 만들 영문 별칭 (`load_name_aliases`).
+
+    Returns:
+        dict: 기록된 meta.json 내용.
+    """
+    column_map = dict(column_map or DEFAULT_COLUMN_MAP)
+    csv_sha1 = file_sha1(str(csv_path))
+    df = pd.read_csv(csv_path).fillna('')
+    index = CharacterIndex(df, column_map, aliases=aliases)
+
+    out_dir = os.path.abspath(out_dir)
+    os.makedirs(out_dir, exist_ok=True)
+    name = f"roster-v{SNAPSHOT_FORMAT}-{csv_sha1[:10]}"
+    tmp_dir = os.path.join(out_dir, f"{name}.tmp-{os.getpid()}")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    def save(name, array):
+        np.save(os.path.join(tmp_dir, name), array, allow_pickle=False)
+
+    haystack, choseong, grams, search_offsets, search_rows = index.search.to_arrays()
+    rows = {
+        "columns": {str(col): index.df[col].tolist() for col in index.df.columns},
+        "search": {"haystack": haystack, "choseong": choseong, "grams": grams},
+    }
+    with open(os.path.join(tmp_dir, ROWS_NAME), "w", encoding="utf-8") as f:
+        json.dump(rows, f, ensure_ascii=False)
+    save("search_offsets.npy", np.asarray(search_offsets, dtype=np.int64))
+    save("search_rows.npy", np.asarray(search_rows, dtype=np.int32))
+    save("fingerprints.npy", np.asarray(index.fingerprints, dtype=np.uint64))
+
+    facets = {}
+    for n, key in enumerate(FACET_KEYS):
+        facet = index.facets[key]
+        save(f"facet_{n}_membership.npy", facet.membership)
+        save(f"facet_{n}_codes.npy", facet.codes)
+        list_codes, list_offsets = facet.encode_lists(index.lists[key])
+        save(f"facet_{n}_list_codes.npy", list_codes)
+        save(f"facet_{n}_list_offsets.npy", list_offsets)
+        facets[key] = facet.values
+    save("release_days.npy", np.asarray(index.release_days, dtype=float))
+
+    icons = []
+    with open(os.path.join(tmp_dir, ICONS_NAME), "wb") as blob:
+        offset = 0
+        for path in (_icon_files(index) if include_icons else []):
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+                with open(path, "rb") as f:
+                    data = base64.b64encode(f.read())
+            except OSError as e:
+                print(f"[Skip] {path}: {e}", file=sys.stderr)
+                continue
+            blob.write(data)
+            icons.append([_rel_path(path), offset, len(data), mtime_ns])
+            offset += len(data)
+
+    meta = {
+        "format": SNAPSHOT_FORMAT,
+        "csv_sha1": csv_sha1,
+        "aliases_digest": _aliases_digest(aliases),
+        "rows": len(index),
+        "column_map": column_map,
+        "facets": facets,
+        "icons": icons,
+    }
+    with open(os.path.join(tmp_dir, META_NAME), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+    final_dir = os.path.join(out_dir, name)
+    shutil.rmtree(final_dir, ignore_errors=True)
+    os.replace(tmp_dir, final_dir)
+
+    pointer_tmp = os.path.join(out_dir, CURRENT_NAME + ".tmp")
+    with open(pointer_tmp, "w", encoding="utf-8") as f:
+        json.dump({"dir": name}, f)
+    os.replace(pointer_tmp, os.path.join(out_dir, CURRENT_NAME))
+
+    # 이번 스냅샷이 아닌 이전 디렉토리 정리
+    for entry in os.listdir(out_dir):
+        if entry.startswith("roster-") and entry != name:
+            shutil.rmtree(os.path.join(out_dir, entry), ignore_errors=True)
+    return meta
+
+
+# ─────────────────────────────────────────────
+# 스냅샷 로드
+# ─────────────────────────────────────────────
+class PreencodedIcons:
+    """
+    스냅샷의 `icons.bin` 을 메모리 맵으로 열어, 요청된 아이콘의 Base64 문자열만 잘라 반환합니다.
+    `eden_assets.ICON_CACHE.set_preencoded` 에 등록하여 사용하며, 파일 mtime 이 빌드 당시와 다르면 None.
+    """
+
+    def __init__(self, blob_path: str, entries: list):
+        self._entries = {}
+        # 프로젝트 안의 상대경로는 abspath 없이 이어 붙여도 `_cache_key` 와 같은 키 (항목 수백 개라 로드 시간에 영향)
+        prefix = str(BASE_DIR) + os.sep
+        for rel, offset, length, mtime_ns in entries:
+            if rel.startswith("..") or "/." in rel or rel.startswith("."):
+                key = _cache_key(os.path.join(BASE_DIR, rel))
+            else:
+                key = os.path.normcase(prefix + rel.replace("/", os.sep))
+            self._entries[key] = (offset, length, mtime_ns)
+        self._file = None
+        self._map = None
+        if self._entries and os.path.getsize(blob_path) > 0:
+            self._file = open(blob_path, "rb")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, mtime_ns: int):
+        entry = self._entries.get(key)
+        if entry is None or self._map is None or entry[2] != mtime_ns:
+            return None
+        offset, length, _ = entry
+        return self._map[offset:offset + length].decode("ascii")
+
+
+class RosterSnapshot:
+    """
+    로드된 스냅샷.
+
+    Attributes:
+        index (CharacterIndex): 스냅샷에서 복원한 인덱스.
+        icons (PreencodedIcons): 미리 인코딩된 아이콘 Base64 공급자.
+        meta (dict): meta.json 내용.
+        path (str): 스냅샷 디렉토리.
+    """
+
+    def __init__(self, index: CharacterIndex, icons: PreencodedIcons, meta: dict, path: str):
+        self.index = index
+        self.icons = icons
+        self.meta = meta
+        self.path = path
+
+
+def load_snapshot(csv_path, column_map: dict, aliases: dict = None, snapshot_dir=SNAPSHOT_DIR):
+    """
+    현재 스냅샷이 `csv_path` 의 내용·컬럼 매핑과 일치하면 메모리 맵으로 읽어 반환합니다.
+
+    Args:
+        csv_path: 앱이 사용하려는 CSV 경로 (내용 해시로 스냅샷 유효성 확인).
+        column_map (dict): 컬럼 이름 매핑.
+        aliases (dict, optional): 이름 검색용 영문 별칭. 스냅샷을 만들 때와 다르면 검색 인덱스만 다시 만듭니다.
+        snapshot_dir: 스냅샷 루트 디렉토리.
+
+    Returns:
+        RosterSnapshot | None: 스냅샷이 없거나, 형식이 다르거나, CSV 가 바뀌었으면 None.
+    """
+    try:
+        with open(os.path.join(snapshot_dir, CURRENT_NAME), encoding="utf-8") as f:
+            path = os.path.join(snapshot_dir, json.load(f)["dir"])
+        with open(os.path.join(path, META_NAME), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("format") != SNAPSHOT_FORMAT or meta.get("column_map") != dict(column_map):
+            return None
+        if meta.get("csv_sha1") != file_sha1(str(csv_path)):
+            return None
+
+        def load(name):
+            return np.load(os.path.join(path, name), mmap_mode="r")
+
+        with open(os.path.join(path, ROWS_NAME), encoding="utf-8") as f:
+            rows = json.load(f)
+        df = pd.DataFrame(rows["columns"])
+        # Facet 행렬·출시일은 메모리 맵 그대로, 리스트·해시는 파이썬 객체로 한 번에 변환
+        facets, lists = {}, {}
+        for n, key in enumerate(FACET_KEYS):
+            facet = Facet.from_arrays(meta["facets"][key], load(f"facet_{n}_membership.npy"), load(f"facet_{n}_codes.npy"))
+            facets[key] = facet
+            lists[key] = facet.decode_lists(load(f"facet_{n}_list_codes.npy"), load(f"facet_{n}_list_offsets.npy"))
+        fingerprints = load("fingerprints.npy").tolist()
+        release_days = load("release_days.npy")
+        if meta.get("aliases_digest") == _aliases_digest(aliases):
+            search_rows = rows["search"]
+            search = NameSearchIndex.from_arrays(
+                search_rows["haystack"], search_rows["choseong"], search_rows["grams"],
+                load("search_offsets.npy").tolist(), load("search_rows.npy").tolist(),
+            )
+        else:
+            search = NameSearchIndex(df[column_map['이름']].astype(str).tolist(), aliases)
+        icons = PreencodedIcons(os.path.join(path, ICONS_NAME), meta.get("icons", []))
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    if len(df) != meta.get("rows") or len(fingerprints) != len(df) or search.size != len(df):
+        return None
+    index = CharacterIndex.from_prepared(df, column_map, facets, release_days, lists, fingerprints, search)
+    return RosterSnapshot(index, icons, meta, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Another Eden 룰렛 로스터 스냅샷 빌드")
+    parser.add_argument("--csv", default=str(DEFAULT_CSV_PATH), help="원본 CSV 경로")
+    parser.add_argument("--out", default=str(SNAPSHOT_DIR), help="스냅샷 루트 디렉토리")
+    parser.add_argument("--no-icons", action="store_true", help="아이콘 사전 인코딩 생략")
+    args = parser.parse_args(argv)
+
+    aliases = load_name_aliases(str(DEFAULT_ALIAS_CSV_PATH))
+    meta = build_snapshot(args.csv, out_dir=args.out, include_icons=not args.no_icons, aliases=aliases)
+    icon_bytes = sum(entry[2] for entry in meta["icons"])
+    print(f"캐릭터 {meta['rows']}명, 아이콘 {len(meta['icons'])}개 ({icon_bytes / 1024:,.1f} KB) → {args.out}")
+
+    # 로드 확인
+    snapshot = load_snapshot(args.csv, meta["column_map"], aliases, args.out)
+    if snapshot is None:
+        print("[Warn] 기록한 스냅샷을 다시 읽지 못했습니다.", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
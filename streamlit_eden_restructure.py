@@ -2,25 +2,41 @@
 Streamlit 애플리케이션 스크립트.
 Another Eden 캐릭터 정보를 표시하고, 필터링하며, 룰렛(슬롯머신) 기능을 제공합니다.
 """
+import time
+_IMPORT_START = time.perf_counter()
+
 import os
-import pandas as pd
-import streamlit as st
-from typing import List
-import random
 import math
-import streamlit.components.v1 as components
-import base64
 import uuid
-import time
 import html
-import traceback
-import re
+import json
 from pathlib import Path
-import unicodedata
+
+import pandas as pd
+import streamlit as st
+import streamlit.components.v1 as components
+
+# import 비용이 큰 선택 기능의 의존성(공정성 시뮬레이션의 프로세스 풀, 정적 서버의 http.server)은
+# 각 모듈이 실제로 사용할 때 불러오고, 스냅샷 모듈은 인덱스를 처음 만들 때만 import
+from eden_data import CharacterIndex, FilterEngine, DEFAULT_COLUMN_MAP, FILTER_CACHE, CARD_FRAGMENT_CACHE, ROSTER_STORE, MATCH_ALL, MATCH_ANY, csv_version, split_list
+from eden_search import load_name_aliases
+from eden_roulette import RouletteEngine, simulate_fairness
+from eden_assets import ICON_CACHE, ASSET_MANIFEST, ASSET_RESOLVER, ICON_WARMUP, start_static_server, BADGE_ICON_SIZE, CARD_ICON_SIZE, SLOT_ICON_SIZE, mime_for
+from eden_profile import StageProfiler, PROFILE_HISTORY, profiling_enabled_by_env
+from eden_log import DebugLog, EVENT_COUNTS, debug_enabled_by_env, log_capacity
+
+# 이번 실행의 모듈 import 시간 (첫 실행 이후에는 import 캐시로 거의 0)
+_IMPORT_SECONDS = time.perf_counter() - _IMPORT_START
+
+# 이번 실행의 단계별 시간 측정기 (스크립트가 다시 실행될 때마다 새로 만들어지며, main() 에서 켜고 끔)
+PROFILER = StageProfiler()
 
 # 프로젝트 루트 절대경로 (이 스크립트 기준)
 BASE_DIR = Path(__file__).parent.resolve()
 
+# 영문 ↔ 한글 캐릭터명 매핑 (이름 검색 별칭)
+ALIAS_CSV_PATH = BASE_DIR / "Matching_names.csv"
+
 # Streamlit 페이지 설정 (스크립트 최상단으로 이동)
 st.set_page_config(page_title="🎲 Another Eden 캐릭터 룰렛", layout="wide")
 
@@ -28,71 +44,176 @@ st.set_page_config(page_title="🎲 Another Eden 캐릭터 룰렛", layout="wide
 # 전역 디버그 로거 및 안전 아이콘 변환 헬퍼
 # ─────────────────────────────────────────────
 
-def log_debug(message: str):
-    """디버그 모드 시 session_state 에 로그를 누적 저장."""
-    if "debug_logs" not in st.session_state:
-        st.session_state["debug_logs"] = []
-    st.session_state["debug_logs"].append(message)
+# 이번 실행에서 세션 로그를 남길지 여부 (main() 에서 사이드바 토글/환경변수 EDEN_DEBUG 로 설정)
+DEBUG_ENABLED = debug_enabled_by_env()
+
 
+def session_log() -> DebugLog:
+    """현재 세션의 디버그 로그 링 버퍼 (없으면 생성)."""
+    log = st.session_state.get("debug_logs")
+    if not isinstance(log, DebugLog):
+        log = st.session_state["debug_logs"] = DebugLog(log_capacity())
+    return log
 
-def safe_icon_to_data_uri(path: str) -> str:
-    """아이콘 경로를 data URI 로 안전하게 변환하여 반환."""
-    placeholder = "data:image/gif;base64,R0lGODlhEAAQAIABAP///wAAACH5BAEKAAEALAAAAAAQABAAAAIijI+py+0Po5yUFQA7"
-    def normalize_path(p:str)->str:
-        p = unicodedata.normalize("NFKC", p)
-        return p.replace("\\","/").strip().lstrip("\ufeff").replace("\u00A0","")
 
-    path = normalize_path(path or '')
-    if not path:
-        log_debug("[EmptyVal] icon path is empty.")
+def log_debug(event: str, *args):
+    """
+    디버그 이벤트를 기록합니다. 프로세스 공용 카운터는 항상 올리고, 디버그 모드일 때만
+    세션 링 버퍼(session_state["debug_logs"])에 남깁니다. 인자는 표시할 때 문자열로 바뀝니다.
+
+    Args:
+        event (str): 이벤트 종류. 예) "NoFile", "EncodeErr", "CaseSearchErr"
+        *args: 경로, 예외 등 상세 정보.
+    """
+    EVENT_COUNTS.add(event)
+    if DEBUG_ENABLED:
+        session_log().append(event, *args)
+
+
+# 아이콘을 찾지 못했을 때 사용하는 투명 GIF
+PLACEHOLDER_ICON_URI = "data:image/gif;base64,R0lGODlhEAAQAIABAP///wAAACH5BAEKAAEALAAAAAAQABAAAAIijI+py+0Po5yUFQA7"
+
+
+def resolve_icon_path(path: str):
+    """
+    CSV 의 아이콘 경로를 실제 파일의 절대경로로 변환하여 반환.
+    원격 URL·data URI 는 그대로 반환하고, 파일을 찾지 못하면 None 을 반환합니다.
+    대소문자 무시 탐색은 `ASSET_RESOLVER` 가 미리 스캔한 표 조회로 처리하며,
+    없는 파일은 로드 시 `report_missing_assets` 가 한 번에 기록하므로 여기서는 로그를 남기지 않습니다.
+    """
+    return ASSET_RESOLVER.resolve(path)
+
+
+def asset_cache_token() -> tuple:
+    """썸네일 manifest·URL 모드·아이콘 디렉토리 스캔 상태를 합친 토큰 (렌더링 결과 캐시 키)."""
+    return (ASSET_MANIFEST.version(), ASSET_RESOLVER.version())
+
+
+def report_missing_assets(index: CharacterIndex, csv_path: str, cache_version):
+    """
+    CSV 가 참조하지만 실제 파일이 없는 아이콘을 로드 시점에 한 번에 찾아 디버그 로그에 남깁니다.
+    결과는 CSV·아이콘 디렉토리 버전별로 공용 캐시에 보관하고, 세션마다 버전당 한 번만 기록합니다.
+    `cache_version` 은 `FILTER_CACHE` 의 데이터 버전 (CSV 버전, 별칭 버전).
+    """
+    resolver_version = ASSET_RESOLVER.version()
+    missing = FILTER_CACHE.get_or_compute(
+        csv_path, cache_version, ('missing_assets', resolver_version),
+        lambda: ASSET_RESOLVER.missing(index.icon_paths()),
+    )
+    report_key = (csv_path, cache_version, resolver_version)
+    if st.session_state.get('missing_assets_reported') == report_key:
+        return
+    st.session_state['missing_assets_reported'] = report_key
+    for dir_path, error in ASSET_RESOLVER.errors:
+        log_debug("CaseSearchErr", dir_path, error)
+    if missing:
+        preview = ", ".join(missing[:20]) + (" ..." if len(missing) > 20 else "")
+        log_debug("NoFile", f"아이콘 {len(missing)}개 없음", preview)
+
+
+def report_roster_reload(csv_path: str, column_map: dict, data_version):
+    """
+    이 세션이 보던 CSV 가 실행 중에 갱신되었으면 바뀐 캐릭터 요약을 토스트와 디버그 로그로 한 번 알립니다.
+    """
+    previous = st.session_state.get('roster_version')
+    st.session_state['roster_version'] = data_version
+    if previous is None or previous == data_version:
+        return
+    entry = ROSTER_STORE.current(csv_path, column_map)
+    if entry is not None and entry.version == data_version and entry.diff:
+        log_debug("RosterReload", entry.diff.summary())
+        st.toast(f"캐릭터 데이터 갱신: {entry.diff.summary()}")
+
+
+def safe_icon_to_data_uri(path: str, size: int = None) -> str:
+    """
+    아이콘 경로를 data URI 로 안전하게 변환하여 반환.
+    `size`(표시 크기, px)를 주면 `build_assets.py` 로 미리 만든 썸네일 중 가장 작은 변형을 사용합니다.
+    """
+    placeholder = PLACEHOLDER_ICON_URI
+    path = resolve_icon_path(path)
+    if path is None:
         return placeholder
     if path.startswith(("http://", "https://", "data:image")):
         return path
-    # 상대경로 → 절대경로 변환 (Streamlit Cloud 등에서 작동 보장)
-    if not os.path.isabs(path):
-        path = os.path.join(BASE_DIR, path.lstrip("/\\"))
-    if not os.path.exists(path):
-        # --- 대소문자 무시하고 같은 이름 파일 탐색 (Streamlit Cloud 대비) ---
-        dir_path, file_name = os.path.split(path)
-        try:
-            if dir_path and os.path.isdir(dir_path):
-                lc = file_name.lower()
-                for f in os.listdir(dir_path):
-                    if f.lower() == lc:
-                        path = os.path.join(dir_path, f)
-                        break
-        except Exception as e:
-            log_debug(f"[CaseSearchErr] {dir_path}: {e}")
-        if not os.path.exists(path):
-            log_debug(f"[NoFile] {path}")
-            return placeholder
+    if size:
+        path = ASSET_MANIFEST.variant_for(path, size) or path
     try:
         b64_str = get_image_base64(path)
         if not b64_str:
             raise ValueError("Base64 encode failed")
-        return f"data:image/png;base64,{b64_str}"
+        return f"data:{mime_for(path)};base64,{b64_str}"
     except Exception as exc:
-        log_debug(f"[EncodeErr] {path}: {exc}")
+        log_debug("EncodeErr", path, exc)
         return placeholder
 
+
+def configure_asset_serving():
+    """
+    환경변수 EDEN_ASSET_MODE=url 이면 아이콘을 data URI 대신 정적 URL 로 참조하도록 설정.
+    기준 URL 우선순위:
+      1. EDEN_ASSET_BASE_URL (CDN/리버스 프록시 권장)
+      2. 내장 정적 서버: EDEN_ASSET_HOST(브라우저가 접속할 호스트)가 있을 때만 사용.
+         EDEN_ASSET_BIND(기본 0.0.0.0)에 바인딩하고 EDEN_ASSET_PORT(기본 8765)로 서빙하며,
+         해시 파일명에 `immutable` 캐시 헤더를 붙입니다.
+      3. Streamlit 정적 서빙(server.enableStaticServing): Streamlit 기본 캐시 헤더로 서빙되므로
+         해시 파일명이라도 장기 캐시는 되지 않습니다.
+    사용할 수 있는 경로가 없으면 data URI 방식을 유지합니다. 서버 밖의 브라우저가 접속할 수 없는
+    127.0.0.1 주소는 광고하지 않습니다.
+    """
+    base_url = None
+    if os.environ.get("EDEN_ASSET_MODE", "inline").lower() == "url":
+        base_url = os.environ.get("EDEN_ASSET_BASE_URL")
+        public_host = os.environ.get("EDEN_ASSET_HOST")
+        if not base_url and public_host:
+            base_url = start_static_server(
+                host=os.environ.get("EDEN_ASSET_BIND", "0.0.0.0"),
+                port=int(os.environ.get("EDEN_ASSET_PORT", "8765")),
+                public_host=public_host,
+            )
+        if not base_url and st.get_option("server.enableStaticServing"):
+            base_url = "app/static/eden/"  # 스크립트 옆 static/ 폴더가 /app/static/ 으로 서빙됨
+        if not base_url:
+            log_debug("StaticRoute", "정적 에셋 경로를 사용할 수 없어 data URI 로 대체합니다.")
+    ASSET_MANIFEST.set_base_url(base_url)
+
+
+def icon_src(path: str, size: int) -> str:
+    """
+    <img src> 에 넣을 아이콘 주소를 반환.
+    정적 URL 모드이고 빌드된 썸네일이 있으면 URL 을, 아니면 `safe_icon_to_data_uri` 의 data URI 를 반환합니다.
+    """
+    if ASSET_MANIFEST.base_url:
+        resolved = resolve_icon_path(path)
+        url = ASSET_MANIFEST.url_for(resolved, size) if resolved else None
+        if url:
+            return url
+        return safe_icon_to_data_uri(resolved, size) if resolved else PLACEHOLDER_ICON_URI
+    return safe_icon_to_data_uri(path, size)
+
 # ─────────────────────────────────────────────
 # Streamlit 고급 GUI 구현
 # ─────────────────────────────────────────────
 
-def slot_machine_display(items, winner_index, item_display_duration_ms=50, spin_duration_s=3):
+def slot_machine_display(items, winner_index, item_display_duration_ms=50, spin_duration_s=3, winner_image=None):
     """
     Streamlit HTML 컴포넌트를 사용하여 슬롯머신 형태의 UI를 생성하고 애니메이션을 처리합니다.
     캐릭터 이미지가 빠르게 순환하다가 미리 결정된 당첨자에게 멈추는 효과를 보여줍니다.
 
+    스핀 중 프레임은 작은 썸네일로 충분하므로, 큰 이미지는 `winner_image` 한 장만 받습니다.
+    브라우저는 프레임을 비동기로 미리 불러오며, 아직 로드되지 않은 프레임은 건너뜁니다.
+
     Args:
         items (list): 슬롯머신에 표시될 아이템 리스트.
                       각 아이템은 {'name': str, 'icon_base64': str} 형태의 딕셔너리여야 합니다.
-                      'icon_base64'는 이미지의 Base64 인코딩된 데이터입니다.
+                      'icon_base64'는 이미지의 data URI 또는 (정적 URL 모드에서) 이미지 URL 입니다.
         winner_index (int): `items` 리스트 내에서 당첨자로 결정된 아이템의 인덱스.
         item_display_duration_ms (int, optional): 스핀 중 각 아이템이 화면에 표시되는 시간 (밀리초).
                                                 값이 작을수록 빠르게 지나갑니다. 기본값 50.
         spin_duration_s (int, optional): 전체 스핀 애니메이션이 지속되는 시간 (초).
                                        이 시간 동안 아이템들이 순환한 후 당첨자를 표시합니다. 기본값 3.
+        winner_image (str, optional): 멈췄을 때 표시할 당첨자의 큰 이미지 (data URI 또는 URL).
+                                      없으면 당첨자 프레임 이미지를 그대로 사용합니다.
     """
     # items: [{'name': ..., 'icon_base64': ...}]
     # winner_index: 당첨자 인덱스
@@ -113,8 +234,9 @@ def slot_machine_display(items, winner_index, item_display_duration_ms=50, spin_
 
     # JavaScript에서 사용할 수 있도록 아이템 리스트 (이미지 데이터만)와 당첨자 이름 준비
     # items는 dict 리스트이므로, icon_base64와 name을 추출
-    item_images_js = [item['icon_base64'] for item in items]
-    winner_name_js = items[winner_index]['name']
+    item_images_js = json.dumps([item['icon_base64'] for item in items])
+    winner_name_js = json.dumps(str(items[winner_index]['name']))
+    winner_image_js = json.dumps(winner_image or items[winner_index]['icon_base64'])
 
     html_content = f"""
     <style>
@@ -155,7 +277,7 @@ def slot_machine_display(items, winner_index, item_display_duration_ms=50, spin_
 
     <div id="{slot_id}_container">
         <div id="{slot_id}_image_slot">
-            <img id="{slot_id}_img_tag" src="{item_images_js[0]}" alt="캐릭터 이미지">
+            <img id="{slot_id}_img_tag" src="{html.escape(items[0]['icon_base64'])}" alt="캐릭터 이미지">
         </div>
         <div id="{slot_id}_result_name"></div>
     </div>
@@ -175,7 +297,8 @@ def slot_machine_display(items, winner_index, item_display_duration_ms=50, spin_
 
         const items = {item_images_js};
         const winnerIdx = {winner_index};
-        const winnerName = "{winner_name_js}";
+        const winnerName = {winner_name_js};
+        const winnerImage = {winner_image_js};
         const displayDuration = {item_display_duration_ms};
         const totalSpinTime = {spin_duration_s * 1000}; // 초를 밀리초로
         const numItems = items.length;
@@ -185,6 +308,18 @@ def slot_machine_display(items, winner_index, item_display_duration_ms=50, spin_
         let currentIndex = 0;
         let spinInterval;
         let startTime = Date.now();
+
+        // 당첨 이미지를 가장 먼저, 이어서 프레임들을 비동기로 미리 불러오기
+        const winnerPreload = new Image();
+        winnerPreload.src = winnerImage;
+        const loaded = new Array(numItems).fill(false);
+        loaded[0] = true; // 첫 프레임은 <img> 태그가 이미 불러옴
+        items.forEach((src, i) => {{
+            if (i === 0) return;
+            const img = new Image();
+            img.onload = () => {{ loaded[i] = true; }};
+            img.src = src;
+        }});
         
         // 초기 이미지를 당첨자로 설정 (깜빡임 방지용으로 첫 프레임)
         // 또는 첫번째 아이템으로 시작할 수도 있음
@@ -200,7 +335,11 @@ def slot_machine_display(items, winner_index, item_display_duration_ms=50, spin_
         spinStartSound.play();
 
         function spin() {{
-            currentIndex = (currentIndex + 1) % numItems;
+            // 아직 로드되지 않은 프레임은 건너뜀 (로드된 프레임이 없으면 현재 프레임 유지)
+            for (let step = 1; step <= numItems; step++) {{
+                const next = (currentIndex + step) % numItems;
+                if (loaded[next]) {{ currentIndex = next; break; }}
+            }}
             slotImage.src = items[currentIndex];
             
             let elapsedTime = Date.now() - startTime;
@@ -209,7 +348,7 @@ def slot_machine_display(items, winner_index, item_display_duration_ms=50, spin_
             if (elapsedTime >= totalSpinTime) {{
                 clearInterval(spinInterval);
                 spinStopSound.play(); // 스핀 종료 사운드 재생
-                slotImage.src = items[winnerIdx]; // 최종 당첨자 이미지로 설정
+                slotImage.src = winnerImage; // 최종 당첨자 (큰) 이미지로 설정
                 resultNameDisplay.innerHTML = "🎉 " + winnerName + " 🎉";
                 // 애니메이션을 좀 더 부드럽게 멈추는 효과 (옵션)
                 slotImage.style.transition = "transform 0.3s ease-out";
@@ -238,6 +377,9 @@ def get_image_base64(image_path):
     지정된 경로의 이미지를 읽어 Base64로 인코딩된 문자열을 반환합니다.
     Streamlit HTML 컴포넌트 내에 이미지를 직접 삽입할 때 사용됩니다.
 
+    결과는 프로세스 공용 `ICON_CACHE` 에 (경로, mtime) 기준으로 보관되어
+    재실행이나 다른 세션에서는 디스크를 다시 읽지 않습니다.
+
     Args:
         image_path (str): Base64로 인코딩할 이미지 파일 경로.
 
@@ -246,14 +388,13 @@ def get_image_base64(image_path):
                      파일을 읽거나 인코딩하는 중 오류 발생 시 None 반환.
     """
     try:
-        with open(image_path, "rb") as img_file:
-            return base64.b64encode(img_file.read()).decode()
+        return ICON_CACHE.get_base64(image_path)
     except Exception as e:
         # print(f"Error encoding image {image_path}: {e}") # 디버깅용
         return None
 
 @st.cache_data
-def load_and_prepare_data(csv_path, column_map_config):
+def load_and_prepare_data(csv_path, column_map_config, csv_version=None):
     """
     지정된 CSV 파일로부터 데이터를 로드하고 Streamlit 앱에서 사용하기 적합하도록 준비합니다.
     (데이터 가공 로직은 제거되고, 컬럼 존재 유효성 검사 위주로 단순화됨)
@@ -262,6 +403,8 @@ def load_and_prepare_data(csv_path, column_map_config):
         csv_path (str): 로드할 데이터가 포함된 CSV 파일 경로.
         column_map_config (dict): Streamlit 앱에서 사용할 컬럼명(한글)과 CSV 파일의 실제 컬럼명(영어)을
                                 매핑하는 딕셔너리.
+        csv_version (tuple, optional): `eden_data.csv_version` 값. 캐시 키에만 쓰이며,
+                                       CSV 가 바뀌면 새로 로드되도록 합니다.
 
     Returns:
         tuple: (df, name_col, char_icon_col, ... 등 컬럼명)
@@ -270,7 +413,8 @@ def load_and_prepare_data(csv_path, column_map_config):
         st.error(f"CSV 파일을 찾을 수 없습니다: {csv_path}\n먼저 스크레이퍼를 실행하여 데이터를 생성하세요.")
         st.stop()
     try:
-        df = pd.read_csv(csv_path).fillna('') # NaN 값을 빈 문자열로 대체
+        with PROFILER.stage("CSV 로드"):
+            df = pd.read_csv(csv_path).fillna('') # NaN 값을 빈 문자열로 대체
     except Exception as e:
         st.error(f"CSV 파일 로드 오류: {e}")
         st.stop()
@@ -294,6 +438,41 @@ def load_and_prepare_data(csv_path, column_map_config):
             
     return df, name_col, char_icon_col, rarity_col, attr_col, attr_icon_col, weapon_col, weapon_icon_col, armor_col, armor_icon_col
 
+@st.cache_resource(max_entries=4)
+def load_character_index(csv_path, column_map_config, csv_version=None, alias_version=None) -> CharacterIndex:
+    """
+    CSV 버전별로 한 번만 정규화된 `CharacterIndex` 를 만들어 모든 세션이 공유합니다.
+    (무기 명칭 교정, 희귀도 정규화, 리스트형 컬럼 분리, 사이드바 옵션 계산, 이름 검색 인덱스 생성이 여기서 1회 수행됨)
+    `eden_snapshot.py` 로 만든 스냅샷이 CSV 내용과 일치하면 CSV 파싱·정규화 대신 스냅샷을 메모리 맵으로 읽고,
+    스냅샷에 미리 인코딩된 아이콘을 아이콘 캐시에 연결합니다. 스냅샷이 없거나 오래되었으면 CSV 에서 만듭니다.
+    실행 중에 CSV 가 바뀌면 `ROSTER_STORE` 가 이전 인덱스와 비교해 바뀐 행만 다시 계산하고,
+    해당 카드 HTML 조각만 캐시에서 지웁니다 (나머지 카드 조각은 그대로 재사용).
+
+    Args:
+        csv_path (str): CSV 파일 경로.
+        column_map_config (dict): 컬럼 이름 매핑.
+        csv_version (tuple, optional): `eden_data.csv_version` 값 (캐시 키).
+        alias_version (tuple, optional): Matching_names.csv 의 버전 (캐시 키).
+
+    Returns:
+        CharacterIndex: 읽기 전용으로 사용해야 하는 공유 인덱스.
+    """
+    from eden_snapshot import load_snapshot
+
+    aliases = load_name_aliases(str(ALIAS_CSV_PATH))
+    # 스냅샷은 첫 로드에만 사용 (이후 CSV 변경은 이전 인덱스 기준 증분 갱신이 더 쌈)
+    if ROSTER_STORE.current(csv_path, column_map_config) is None and csv_version:
+        with PROFILER.stage("스냅샷 로드"):
+            snapshot = load_snapshot(csv_path, column_map_config, aliases)
+        if snapshot is not None:
+            ICON_CACHE.set_preencoded(snapshot.icons)
+            ROSTER_STORE.install(csv_path, column_map_config, csv_version, snapshot.index, alias_version)
+            return snapshot.index
+    df, *_ = load_and_prepare_data(csv_path, column_map_config, csv_version)
+    with PROFILER.stage("정규화"):
+        index, _ = ROSTER_STORE.update(csv_path, column_map_config, csv_version, df, aliases, alias_version)
+    return index
+
 def create_character_card_html(row: pd.Series, column_map: dict, is_winner: bool = False) -> str:
     """
     캐릭터 데이터 한 행을 받아 스타일링된 HTML 카드 문자열을 생성합니다.
@@ -306,14 +485,9 @@ def create_character_card_html(row: pd.Series, column_map: dict, is_winner: bool
     Returns:
         생성된 HTML 카드 문자열.
     """
-    def build_list(val: str):
-        if isinstance(val, str) and val:
-            return [item.strip() for item in re.split('[|,]', val) if item.strip()]
-        return []
-
     def create_icon_group_html(names_raw, icons_raw):
-        names = build_list(names_raw)
-        icon_paths = build_list(icons_raw)
+        names = split_list(names_raw)
+        icon_paths = split_list(icons_raw)
         if not names and not icon_paths:
             return '<div class="icon-container"><span class="no-data">-</span></div>'
 
@@ -323,14 +497,24 @@ def create_character_card_html(row: pd.Series, column_map: dict, is_winner: bool
         
         items_html = ""
         for name, path in zip(names, icon_paths):
-            icon_uri = safe_icon_to_data_uri(path)
-            if name or "data:image/png;base64," in icon_uri:
+            # 스프라이트 시트에 있는 배지는 그리드 <style> 의 CSS 클래스로 참조 (이미지 바이트 미포함)
+            resolved = resolve_icon_path(path)
+            sprite_class = ASSET_MANIFEST.sprite_class(resolved) if resolved else None
+            if sprite_class:
+                icon_uri = None
+            else:
+                icon_uri = icon_src(resolved, BADGE_ICON_SIZE) if resolved else PLACEHOLDER_ICON_URI
+            if name or sprite_class or icon_uri != PLACEHOLDER_ICON_URI:
                 escaped_name = html.escape(name)
                 # 아이콘과 텍스트를 함께 표시 (텍스트가 없으면 아이콘만 표시)
                 text_html = f'<span class="eden-text">{escaped_name}</span>' if escaped_name else ''
+                icon_html = (
+                    f'<span class="{sprite_class}" role="img" aria-label="{escaped_name}"></span>' if sprite_class
+                    else f'<img src="{icon_uri}" alt="{escaped_name}">'
+                )
                 items_html += (
                     f'<div class="eden-item" title="{escaped_name}">'
-                    f'<img src="{icon_uri}" alt="{escaped_name}">{text_html}'
+                    f'{icon_html}{text_html}'
                     f'</div>'
                 )
         
@@ -344,7 +528,7 @@ def create_character_card_html(row: pd.Series, column_map: dict, is_winner: bool
         weapon_col, weapon_icon_col = column_map['무기명'], column_map['무기아이콘']
         armor_col, armor_icon_col = column_map['방어구명'], column_map['방어구아이콘']
 
-        char_icon_uri = safe_icon_to_data_uri(row.get(char_icon_col, ''))
+        char_icon_uri = icon_src(row.get(char_icon_col, ''), CARD_ICON_SIZE)
         char_name = html.escape(str(row.get(name_col, '')))
         rarity = html.escape(str(row.get(rarity_col, '')))
         
@@ -357,7 +541,7 @@ def create_character_card_html(row: pd.Series, column_map: dict, is_winner: bool
         return f"""
         <div class="eden-card {winner_class}">
             <div class="card-header">
-                <img src="{char_icon_uri}" class="char-img" alt="{char_name}">
+                <img src="{char_icon_uri}" class="char-img" alt="{char_name}" loading="lazy" decoding="async">
                 <h4>{char_name} <span>({rarity})</span></h4>
             </div>
             <div class="card-body">
@@ -368,98 +552,283 @@ def create_character_card_html(row: pd.Series, column_map: dict, is_winner: bool
         </div>
         """
     except Exception as e:
-        log_debug(f"카드 생성 오류: {row.get(name_col, 'N/A')}, 오류: {e}")
+        log_debug("CardErr", row.get(name_col, 'N/A'), e)
         return "<div class='eden-card error-card'><p>카드 표시 오류</p></div>"
 
+def build_card_grid_html(filtered_df: pd.DataFrame, column_map: dict, winner_name: str = None, cache_scope: tuple = None):
+    """
+    필터링된 캐릭터들의 카드 그리드 HTML(스타일 포함)과 iframe 높이를 생성합니다.
+
+    `cache_scope` 를 주면 카드 HTML 을 (행 내용 해시, 당첨 여부) 단위로 `CARD_FRAGMENT_CACHE` 에 보관하고
+    캐시된 조각을 이어 붙여 그리드를 조립합니다. 당첨자가 바뀌어도 해당 카드 한 장만 교체되고,
+    CSV 가 갱신되어도 내용이 그대로인 카드는 다시 만들지 않습니다. 아이콘 파일이 추가·교체되면
+    `asset_cache_token()` (아이콘 디렉토리 스캔 버전)이 바뀌어 조각을 다시 만듭니다.
+
+    Args:
+        filtered_df: 표시할 캐릭터 DataFrame (index 는 CharacterIndex 의 행 번호).
+        column_map: 컬럼 이름 매핑.
+        winner_name: 룰렛 당첨자 이름 (해당 카드 강조).
+        cache_scope: (CSV 경로, `CharacterIndex.fingerprints`). None 이면 캐시 없이 모든 카드를 새로 생성.
+
+    Returns:
+        tuple: (html 문자열, 컨테이너 높이 px)
+    """
+    if cache_scope is None:
+        card_html_list = [
+            create_character_card_html(row, column_map, is_winner=(row[column_map['이름']] == winner_name))
+            for _, row in filtered_df.iterrows()
+        ]
+    else:
+        source, fingerprints = cache_scope
+        asset_version = asset_cache_token()
+        card_html_list = []
+        for row_id, name in zip(filtered_df.index, filtered_df[column_map['이름']]):
+            is_winner = name == winner_name
+            # 버전은 고정(None): 바뀐 행의 조각은 ROSTER_STORE 가 갱신 시 직접 지움
+            card_html_list.append(CARD_FRAGMENT_CACHE.get_or_compute(
+                source, None, (fingerprints[row_id], is_winner, asset_version),
+                lambda: create_character_card_html(filtered_df.loc[row_id], column_map, is_winner=is_winner),
+            ))
+    card_grid_html = "<div class='card-grid'>" + "".join(card_html_list) + "</div>"
+
+    # 동적 높이 계산 (카드 한 줄의 높이 ~300px, 카드 사이 gap 20px)
+    rows = (len(card_html_list) + 3) // 4 # 한 줄에 4개 카드를 기준으로 줄 수 계산
+    container_height = max(320, rows * 300 + (rows - 1) * 20)
+
+    html_with_styles = f"""
+    <style>
+        .card-grid {{ display: grid; grid-template-columns: repeat(auto-fill, minmax(260px, 1fr)); gap: 20px; }}
+        .eden-card {{ display: flex; flex-direction: column; border: 1px solid #ddd; border-radius: 12px; background: #fff; box-shadow: 0 2px 5px rgba(0,0,0,0.05); transition: all 0.2s ease; }}
+        .eden-card:hover {{ transform: translateY(-3px); box-shadow: 0 6px 12px rgba(0,0,0,0.1); }}
+        .eden-card.winner-card {{ border: 2px solid #FFD700; box-shadow: 0 0 15px rgba(255, 215, 0, 0.7); }}
+        .eden-card .card-header {{ display: flex; align-items: center; padding: 12px; border-bottom: 1px solid #eee; }}
+        .eden-card .char-img {{ width: 50px; height: 50px; object-fit: contain; margin-right: 12px; }}
+        .eden-card h4 {{ margin: 0; font-size: 1.1em; font-weight: 600; color: #333; }}
+        .eden-card h4 span {{ font-size: 0.9em; color: #777; }}
+        .eden-card .card-body {{ padding: 12px; flex-grow: 1; }}
+        .eden-card .info-group {{ margin-bottom: 8px; }}
+        .eden-card .icon-container {{ display: flex; flex-wrap: wrap; align-items: center; gap: 6px; min-height: 30px;}}
+        .eden-card .eden-item {{ display: flex; align-items: center; gap: 4px; }}
+        .eden-card .eden-item img {{ width: 24px; height: 24px; object-fit: contain; }}
+        .eden-card .eden-text {{ font-size: 0.85em; color: #444; }}
+        .eden-card .no-data {{ color: #bbb; font-style: italic; }}
+        .eden-card.error-card {{ justify-content: center; align-items: center; color: red; }}
+        {ASSET_MANIFEST.sprite_css(BADGE_ICON_SIZE)}
+    </style>
+    {card_grid_html}
+    """
+    return html_with_styles, container_height
+
+
+def show_fairness_report(index: CharacterIndex, row_ids, draws: int):
+    """
+    현재 필터 결과를 대상으로 몬테카를로 시뮬레이션을 실행하고 기대/실제 빈도와 카이제곱 검정 결과를 표시합니다.
+    환경변수 EDEN_SIM_WORKERS 가 2 이상이면 청크를 프로세스 풀로 분산합니다.
+    """
+    workers = int(os.environ.get("EDEN_SIM_WORKERS", "0"))
+    with st.spinner(f"{draws:,}회 추첨 중..."):
+        report = simulate_fairness(index, row_ids, draws, workers=workers)
+
+    with st.expander(f"📊 공정성 시뮬레이션 결과 ({report.draws:,}회, {report.elapsed_s:.2f}초)", expanded=True):
+        st.markdown(
+            f"- 캐릭터별 카이제곱: **{report.chi2:,.1f}** (자유도 {report.dof}, p = {report.p_value:.4f})\n"
+            f"- 희귀도별 카이제곱: **{report.rarity_chi2:,.2f}** (자유도 {report.rarity_dof}, p = {report.rarity_p_value:.4f})\n\n"
+            "p 값이 매우 작으면(예: 0.001 미만) 추첨이 기대 확률에서 벗어났다는 뜻입니다."
+        )
+        st.dataframe(report.per_rarity, hide_index=True, use_container_width=True)
+        deviations = report.per_character.reindex(report.per_character['z'].abs().sort_values(ascending=False).index)
+        st.caption("기대 빈도에서 가장 많이 벗어난 캐릭터 (z 점수 기준)")
+        st.dataframe(deviations.head(20), hide_index=True, use_container_width=True)
+
+
+# 카드 그리드 페이지 크기 선택지 (0 = 전체)
+PAGE_SIZE_OPTIONS = [24, 48, 96, 0]
+DEFAULT_PAGE_SIZE = 48
+
+
+def make_filter_key(sel_rarity, sel_attr, attr_mode, sel_weapon, search_name) -> tuple:
+    """필터 선택값을 정렬·정규화한 튜플 (결과 캐시와 룰렛 초기화 판단에 사용)."""
+    return (
+        tuple(sorted(sel_rarity)),
+        tuple(sorted(sel_attr)),
+        attr_mode,
+        tuple(sorted(sel_weapon)),
+        (search_name or '').strip().lower()
+    )
+
+
+def show_profile_report(profiler: StageProfiler, total_s: float):
+    """
+    이번 실행의 단계별 시간을 `debug_logs` 에 남기고, 프로세스 전체 최근 실행 기록과 함께 사이드바에 표시합니다.
+
+    Args:
+        profiler (StageProfiler): 이번 실행의 측정 결과.
+        total_s (float): 이번 실행 전체 시간 (import 포함, 초).
+    """
+    PROFILE_HISTORY.record(profiler)
+    for line in profiler.report_lines():
+        log_debug("Profile", line)
+    log_debug("Profile", f"전체: {total_s * 1000:.1f} ms")
+    with st.sidebar.expander("⏱ 단계별 실행 시간", expanded=True):
+        worst = profiler.top(1)
+        caption = f"이번 실행 전체 {total_s * 1000:.1f} ms"
+        if worst:
+            name, total, _ = worst[0]
+            caption += f" · 가장 오래 걸린 단계: **{name}** ({total * 1000:.1f} ms)"
+        st.caption(caption)
+        st.dataframe(pd.DataFrame(PROFILE_HISTORY.summary(profiler)), hide_index=True, use_container_width=True)
+
+
+def show_debug_log(last: int = 50):
+    """세션 디버그 로그(최근 항목, 이벤트별 수)와 프로세스 전체 이벤트 수·아이콘 캐시 상태를 사이드바에 표시합니다."""
+    log = session_log()
+    with st.sidebar.expander("🐞 디버그 로그", expanded=True):
+        st.caption(f"이 세션: {len(log)}개 보관 (최대 {log.entries.maxlen}, 밀려남 {log.dropped})")
+        if log.counts:
+            st.write(dict(log.counts.most_common()))
+        st.caption("프로세스 전체 이벤트 수")
+        st.write(EVENT_COUNTS.summary())
+        # 용량은 환경변수 EDEN_ICON_CACHE_BYTES 로 조정
+        st.caption("아이콘 캐시 (프로세스 공용)")
+        st.write(ICON_CACHE.stats())
+        if len(log):
+            st.code("\n".join(log.lines(last)), language=None)
+
+
+def start_icon_warmup(index: CharacterIndex, csv_path: str, data_version):
+    """
+    CSV 가 참조하는 아이콘(캐릭터 아이콘은 카드 크기, 스프라이트에 없는 배지는 배지 크기)을
+    백그라운드에서 미리 인코딩합니다. 같은 CSV·에셋 버전이면 프로세스당 한 번만 실행되며,
+    작업 목록도 그때만 만듭니다 (이후 실행에서는 키 비교만 함).
+    URL 모드이거나 환경변수 EDEN_WARMUP=0 이면 실행하지 않습니다.
+    """
+    if ASSET_MANIFEST.base_url or os.environ.get("EDEN_WARMUP", "1") == "0":
+        return
+
+    def build_jobs():
+        jobs = [(path, CARD_ICON_SIZE) for path in index.icon_paths('캐릭터아이콘경로')]
+        badges = set()
+        for key in ('속성아이콘', '무기아이콘', '방어구아이콘'):
+            badges.update(index.icon_paths(key))
+        for path in sorted(badges):
+            resolved = resolve_icon_path(path)
+            if resolved and not ASSET_MANIFEST.sprite_class(resolved):
+                jobs.append((path, BADGE_ICON_SIZE))
+        return jobs
+
+    ICON_WARMUP.start((csv_path, data_version, asset_cache_token()), build_jobs)
+
+
+def show_warmup_progress():
+    """아이콘 예열이 진행 중이면 사이드바에 진행률을 표시합니다."""
+    progress = ICON_WARMUP.progress()
+    if progress["running"] and progress["total"]:
+        st.sidebar.progress(
+            progress["done"] / progress["total"],
+            text=f"아이콘 미리 불러오는 중 {progress['done']}/{progress['total']}",
+        )
+
+
 def main():
     """메인 애플리케이션 함수"""
+    global DEBUG_ENABLED
+    # 단계별 시간 측정: 사이드바 토글(이전 실행 값) 또는 환경변수 EDEN_PROFILE=1
+    run_start = time.perf_counter()
+    PROFILER.enabled = st.session_state.get("profile_mode", profiling_enabled_by_env())
+    PROFILER.add("import", _IMPORT_SECONDS)
+    # 디버그 로그: 사이드바 토글(이전 실행 값) 또는 환경변수 EDEN_DEBUG=1. 프로파일링 결과도 로그로 남김
+    DEBUG_ENABLED = st.session_state.get("debug_mode", debug_enabled_by_env()) or PROFILER.enabled
+
     st.markdown("### Another Eden 캐릭터 룰렛")
+    configure_asset_serving()
     if not os.path.exists("eden_roulette_data.csv"):
         st.warning("eden_roulette_data.csv 파일을 찾을 수 없습니다. `another_eden_gui_scraper copy.py`를 먼저 실행하여 데이터를 생성해주세요.")
         return
 
     # --- 데이터 로드 및 준비 ---
     csv_path = st.sidebar.text_input("CSV 파일 경로", value="eden_roulette_data.csv")
-    column_map = {
-        '희귀도': '희귀도', '이름': '캐릭터명', '캐릭터아이콘경로': '캐릭터아이콘경로',
-        '속성명': '속성명리스트', '속성아이콘': '속성_아이콘경로리스트',
-        '무기명': '무기명리스트', '무기아이콘': '무기_아이콘경로리스트',
-        '방어구명': '방어구명리스트', '방어구아이콘': '방어구_아이콘경로리스트',
-    }
-    df, *_ = load_and_prepare_data(csv_path, column_map)
-
-    # ── 명칭 교정: '주먹' → '권갑' ──
-    weapon_col_name = column_map['무기명']
-    if weapon_col_name in df.columns:
-        df[weapon_col_name] = df[weapon_col_name].astype(str).apply(lambda s: s.replace('주먹', '권갑'))
-
-    # ── 성급(희귀도) 정규화: 복수 표기 시 최고 성급만 남기기 ──
-    def normalize_rarity(val: str) -> str:
-        if not isinstance(val, str):
-            return val
-        val = val.strip()
-        if not val:
-            return val
-        # SA 여부
-        has_sa = 'SA' in val
-        # 모든 숫자 추출
-        nums = re.findall(r'(\d)(?=★)', val)
-        if nums:
-            max_star = max(int(n) for n in nums)
-            return f"{max_star}★{' SA' if has_sa else ''}"
-        return val
-
-    rarity_col_name = column_map['희귀도']
-    if rarity_col_name in df.columns:
-        df[rarity_col_name] = df[rarity_col_name].astype(str).apply(normalize_rarity)
+    column_map = dict(DEFAULT_COLUMN_MAP)
+    # 명칭 교정·희귀도 정규화 등은 CSV 버전별로 한 번만 수행 (load_character_index)
+    data_version = csv_version(csv_path)
+    alias_version = csv_version(str(ALIAS_CSV_PATH))
+    # 이름 검색 결과는 별칭(Matching_names.csv)에도 좌우되므로 공용 결과 캐시는 두 버전을 함께 키로 사용
+    cache_version = (data_version, alias_version)
+    with PROFILER.stage("인덱스 조회"):
+        index = load_character_index(csv_path, column_map, data_version, alias_version)
+    df = index.df
+    report_roster_reload(csv_path, column_map, data_version)
+    # CSV 가 참조하는 아이콘 중 없는 파일은 렌더링 중이 아니라 여기서 한 번에 보고
+    report_missing_assets(index, csv_path, cache_version)
+    # 첫 그리드 렌더링 전에 아이콘 캐시를 백그라운드에서 채움
+    start_icon_warmup(index, csv_path, data_version)
 
     if df is None: return
 
     # --- 사이드바 필터 --- 
     st.sidebar.header("🔎 필터 및 검색")
-    all_attrs = sorted(set(item for sublist in df[column_map['속성명']].dropna().apply(lambda x: re.split('[|,]', x)) for item in sublist if item.strip()))
-    
-    sel_rarity = st.sidebar.multiselect("희귀도", sorted(df[column_map['희귀도']].dropna().unique()))
-    sel_attr = st.sidebar.multiselect("속성 (AND 조건)", all_attrs)
-    sel_weapon = st.sidebar.multiselect("무기", sorted(df[column_map['무기명']].dropna().unique()))
-    search_name = st.sidebar.text_input("이름/성격 검색")
-
-    # --- 필터링 로직 ---
-    filtered_df = df.copy()
-    if sel_rarity: filtered_df = filtered_df[filtered_df[column_map['희귀도']].isin(sel_rarity)]
-    if sel_weapon: filtered_df = filtered_df[filtered_df[column_map['무기명']].isin(sel_weapon)]
-    if sel_attr:
-        for attr in sel_attr:
-            filtered_df = filtered_df[filtered_df[column_map['속성명']].str.contains(attr, na=False, regex=False)]
-    if search_name:
-        search_cols = [column_map['이름'], '성격1', '성격2', '성격3', '성격4']
-        filtered_df = filtered_df[filtered_df[search_cols].apply(
-            lambda row: row.astype(str).str.contains(search_name, case=False, na=False).any(), axis=1
-        )]
+    attr_mode = st.sidebar.radio("속성 조건", ["AND", "OR"], horizontal=True, key="attr_mode")
+    engine = FilterEngine(index, {'속성명': MATCH_ALL if attr_mode == "AND" else MATCH_ANY})
+
+    # 옵션 옆 "(n)" 표시용 개수: 위젯 값은 이전 실행의 session_state 에서 미리 읽어 계산
+    prev_rarity = st.session_state.get("sel_rarity", [])
+    prev_attr = st.session_state.get("sel_attr", [])
+    prev_weapon = st.session_state.get("sel_weapon", [])
+    prev_search = st.session_state.get("search_name", "")
+    with PROFILER.stage("필터링"):
+        facet_counts = FILTER_CACHE.get_or_compute(
+            csv_path, cache_version,
+            ('counts', make_filter_key(prev_rarity, prev_attr, attr_mode, prev_weapon, prev_search)),
+            lambda: engine.facet_counts({'희귀도': prev_rarity, '속성명': prev_attr, '무기명': prev_weapon}, prev_search),
+        )
+    def with_count(key):
+        return lambda v: f"{v} ({facet_counts[key].get(v, 0)})"
+
+    sel_rarity = st.sidebar.multiselect("희귀도", index.options('희귀도'), format_func=with_count('희귀도'), key="sel_rarity")
+    sel_attr = st.sidebar.multiselect(f"속성 ({attr_mode} 조건)", index.options('속성명'), format_func=with_count('속성명'), key="sel_attr")
+    sel_weapon = st.sidebar.multiselect("무기", index.options('무기명'), format_func=with_count('무기명'), key="sel_weapon")
+    search_name = st.sidebar.text_input("이름 검색 (한글/영문/초성)", key="search_name")
+
+    # --- 필터링 로직 (사전 계산된 값별 마스크의 벡터 연산, 결과는 필터 키별로 공용 캐시) ---
+    current_filter_key = make_filter_key(sel_rarity, sel_attr, attr_mode, sel_weapon, search_name)
+    with PROFILER.stage("필터링"):
+        row_ids = FILTER_CACHE.get_or_compute(
+            csv_path, cache_version, ('rows', current_filter_key),
+            lambda: engine.query({'희귀도': sel_rarity, '속성명': sel_attr, '무기명': sel_weapon}, search_name).nonzero()[0],
+        )
+        filtered_df = df.iloc[row_ids]
 
     # --- 룰렛 기능 ---
     st.sidebar.header("🎰 룰렛")
     if st.sidebar.button("룰렛 돌리기!", use_container_width=True):
         if not filtered_df.empty:
-            winner_series = filtered_df.sample(1).iloc[0]
+            # 당첨자와 릴 후보를 한 번에 추첨 (eden_roulette 의 벡터화된 추첨 경로)
+            with PROFILER.stage("룰렛 추첨"):
+                spin = RouletteEngine(index).spin(row_ids)
+            winner_series = df.iloc[spin.winner]
             st.session_state['roulette_winner'] = winner_series.to_dict()
-            
-            # 슬롯머신용 데이터 준비
-            roulette_candidates = filtered_df.sample(n=min(len(filtered_df), 50))
+
+            # 슬롯머신용 데이터 준비 — 스핀 프레임은 카드 크기 썸네일만 사용 (큰 이미지는 당첨자 한 장만)
+            reel_df = df.iloc[spin.reel]
             st.session_state['roulette_items'] = [
-                {"name": r[column_map['이름']], "icon_base64": safe_icon_to_data_uri(r[column_map['캐릭터아이콘경로']])}
-                for _, r in roulette_candidates.iterrows()
+                {"name": name, "icon_base64": icon_src(icon_path, CARD_ICON_SIZE)}
+                for name, icon_path in zip(reel_df[column_map['이름']], reel_df[column_map['캐릭터아이콘경로']])
             ]
-            # 당첨자를 후보 리스트의 특정 위치에 삽입
-            winner_item = {"name": winner_series[column_map['이름']], "icon_base64": safe_icon_to_data_uri(winner_series[column_map['캐릭터아이콘경로']])}
-            winner_index = random.randint(0, len(st.session_state['roulette_items']) -1)
-            st.session_state['roulette_items'][winner_index] = winner_item
-            st.session_state['roulette_winner_index'] = winner_index
+            st.session_state['roulette_winner_index'] = spin.winner_index
+            st.session_state['roulette_winner_image'] = icon_src(winner_series[column_map['캐릭터아이콘경로']], SLOT_ICON_SIZE)
             st.session_state['roulette_trigger'] = True  # 애니메이션 1회용 트리거
         else:
             st.sidebar.warning("필터링된 캐릭터가 없습니다.")
             st.session_state.pop('roulette_winner', None)
 
+    # --- 공정성 시뮬레이션 (룰렛과 같은 추첨 경로로 대량 추첨) ---
+    with st.sidebar.expander("📊 공정성 시뮬레이션"):
+        sim_draws = st.number_input("추첨 횟수", min_value=10_000, max_value=50_000_000, value=1_000_000, step=100_000)
+        run_simulation = st.button("시뮬레이션 실행", use_container_width=True)
+
+    show_warmup_progress()
+    st.sidebar.checkbox("⏱ 단계별 실행 시간 측정", value=profiling_enabled_by_env(), key="profile_mode")
+    st.sidebar.checkbox("🐞 디버그 로그 표시", value=debug_enabled_by_env(), key="debug_mode")
+
     # <<< 사이드바 하단 저작권 정보 (올바른 위치에 수정 완료) >>>
     st.sidebar.markdown("---") 
     st.sidebar.caption(
@@ -471,70 +840,65 @@ def main():
     
 
     # 필터 변경 시 기존 룰렛 데이터 초기화 (선택적)
-    current_filter_key = (
-        tuple(sorted(sel_rarity)),
-        tuple(sorted(sel_attr)),
-        tuple(sorted(sel_weapon)),
-        search_name.strip().lower()
-    )
     if 'prev_filter_key' in st.session_state and st.session_state['prev_filter_key'] != current_filter_key:
         # 필터가 바뀌면 룰렛 결과 초기화
         st.session_state.pop('roulette_items', None)
         st.session_state.pop('roulette_winner_index', None)
+        st.session_state.pop('roulette_winner_image', None)
         st.session_state.pop('roulette_trigger', None)
+        st.session_state['grid_page'] = 1  # 그리드는 첫 페이지부터
     st.session_state['prev_filter_key'] = current_filter_key
 
     # --- 룰렛 결과 표시 ---
     if st.session_state.get('roulette_trigger'):
         # 버튼 눌린 직후 애니메이션 1회 실행
-        slot_machine_display(
-            items=st.session_state['roulette_items'],
-            winner_index=st.session_state['roulette_winner_index'],
-            spin_duration_s=5
-        )
+        with PROFILER.stage("HTML 전송"):
+            slot_machine_display(
+                items=st.session_state['roulette_items'],
+                winner_index=st.session_state['roulette_winner_index'],
+                spin_duration_s=5,
+                winner_image=st.session_state.get('roulette_winner_image'),
+            )
         # 트리거 끄기 -> 재실행 시 애니메이션 반복 방지
         st.session_state['roulette_trigger'] = False
 
+    if run_simulation:
+        if filtered_df.empty:
+            st.warning("필터링된 캐릭터가 없어 시뮬레이션할 수 없습니다.")
+        else:
+            show_fairness_report(index, row_ids, int(sim_draws))
+
     # --- 캐릭터 카드 그리드 표시 ---
     st.markdown(f"#### 총 {len(filtered_df)}명")
     winner_name = st.session_state.get('roulette_winner', {}).get(column_map['이름'])
 
-    card_html_list = [
-        create_character_card_html(row, column_map, is_winner=(row[column_map['이름']] == winner_name))
-        for _, row in filtered_df.iterrows()
-    ]
-
-    if not card_html_list:
+    if filtered_df.empty:
         st.info("표시할 캐릭터가 없습니다. 필터 조건을 확인해주세요.")
     else:
-        card_grid_html = "<div class='card-grid'>" + "".join(card_html_list) + "</div>"
-        
-        # 동적 높이 계산 (카드 한 줄의 높이 ~300px, 카드 사이 gap 20px)
-        rows = (len(card_html_list) + 3) // 4 # 한 줄에 4개 카드를 기준으로 줄 수 계산
-        container_height = max(320, rows * 300 + (rows - 1) * 20)
-
-        html_with_styles = f"""
-        <style>
-            .card-grid {{ display: grid; grid-template-columns: repeat(auto-fill, minmax(260px, 1fr)); gap: 20px; }}
-            .eden-card {{ display: flex; flex-direction: column; border: 1px solid #ddd; border-radius: 12px; background: #fff; box-shadow: 0 2px 5px rgba(0,0,0,0.05); transition: all 0.2s ease; }}
-            .eden-card:hover {{ transform: translateY(-3px); box-shadow: 0 6px 12px rgba(0,0,0,0.1); }}
-            .eden-card.winner-card {{ border: 2px solid #FFD700; box-shadow: 0 0 15px rgba(255, 215, 0, 0.7); }}
-            .eden-card .card-header {{ display: flex; align-items: center; padding: 12px; border-bottom: 1px solid #eee; }}
-            .eden-card .char-img {{ width: 50px; height: 50px; object-fit: contain; margin-right: 12px; }}
-            .eden-card h4 {{ margin: 0; font-size: 1.1em; font-weight: 600; color: #333; }}
-            .eden-card h4 span {{ font-size: 0.9em; color: #777; }}
-            .eden-card .card-body {{ padding: 12px; flex-grow: 1; }}
-            .eden-card .info-group {{ margin-bottom: 8px; }}
-            .eden-card .icon-container {{ display: flex; flex-wrap: wrap; align-items: center; gap: 6px; min-height: 30px;}}
-            .eden-card .eden-item {{ display: flex; align-items: center; gap: 4px; }}
-            .eden-card .eden-item img {{ width: 24px; height: 24px; object-fit: contain; }}
-            .eden-card .eden-text {{ font-size: 0.85em; color: #444; }}
-            .eden-card .no-data {{ color: #bbb; font-style: italic; }}
-            .eden-card.error-card {{ justify-content: center; align-items: center; color: red; }}
-        </style>
-        {card_grid_html}
-        """
-        st.components.v1.html(html_with_styles, height=container_height)
+        # 페이지 단위로 현재 보이는 카드만 생성·전송 (전체 보기는 page_size 0)
+        col_size, col_page = st.columns(2)
+        page_size = col_size.selectbox(
+            "페이지당 카드 수", PAGE_SIZE_OPTIONS, index=PAGE_SIZE_OPTIONS.index(DEFAULT_PAGE_SIZE),
+            format_func=lambda n: "전체" if n == 0 else f"{n}개", key="grid_page_size"
+        )
+        num_pages = math.ceil(len(filtered_df) / page_size) if page_size else 1
+        if not 1 <= st.session_state.get('grid_page', 1) <= num_pages:
+            st.session_state['grid_page'] = 1
+        page = col_page.number_input(f"페이지 (총 {num_pages})", min_value=1, max_value=num_pages, step=1, key="grid_page")
+        page_df = filtered_df.iloc[(page - 1) * page_size: page * page_size] if page_size else filtered_df
+
+        with PROFILER.stage("카드 렌더링"):
+            html_with_styles, container_height = FILTER_CACHE.get_or_compute(
+                csv_path, cache_version, ('grid', current_filter_key, page, page_size, winner_name, asset_cache_token()),
+                lambda: build_card_grid_html(page_df, column_map, winner_name, cache_scope=(csv_path, index.fingerprints)),
+            )
+        with PROFILER.stage("HTML 전송"):
+            components.html(html_with_styles, height=container_height)
+
+    if PROFILER.enabled:
+        show_profile_report(PROFILER, _IMPORT_SECONDS + time.perf_counter() - run_start)
+    if st.session_state.get("debug_mode"):
+        show_debug_log()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,64 @@
+"""
+헤드리스 룰렛 서비스(`eden_service`) 요청 처리 테스트.
+저장소의 CSV 로 서버를 임의 포트에 띄워 실제 HTTP 요청을 보냅니다.
+
+실행:
+    python -m unittest test_eden_service
+"""
+import json
+import threading
+import unittest
+from http.client import HTTPConnection
+
+from eden_service import RouletteService, make_server, MAX_BODY_BYTES
+
+
+class PostBodyTest(unittest.TestCase):
+    """POST /spin 의 Content-Length 검증: 잘못된 값은 연결을 끊지 않고 JSON 오류로 응답해야 합니다."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = make_server(RouletteService(), port=0, quiet=True)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def post(self, body: bytes, content_length: str):
+        conn = HTTPConnection(*self.server.server_address[:2], timeout=10)
+        try:
+            conn.putrequest("POST", "/spin")
+            conn.putheader("Content-Type", "application/json")
+            conn.putheader("Content-Length", content_length)
+            conn.endheaders(body)
+            response = conn.getresponse()
+            return response.status, json.loads(response.read())
+        finally:
+            conn.close()
+
+    def test_valid_body(self):
+        body = json.dumps({"seed": 1, "reel": 5}).encode()
+        status, payload = self.post(body, str(len(body)))
+        self.assertEqual(status, 200)
+        self.assertIn("winner", payload)
+
+    def test_malformed_length(self):
+        status, payload = self.post(b"{}", "abc")
+        self.assertEqual(status, 400)
+        self.assertIn("error", payload)
+
+    def test_negative_length(self):
+        status, payload = self.post(b"{}", "-5")
+        self.assertEqual(status, 400)
+        self.assertIn("error", payload)
+
+    def test_oversized_length(self):
+        status, payload = self.post(b"{}", str(MAX_BODY_BYTES + 1))
+        self.assertEqual(status, 413)
+        self.assertIn("error", payload)
+
+
+if __name__ == "__main__":
+    unittest.main()